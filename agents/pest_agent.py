@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Optional
+
+from tools.pest_knowledge import PestKnowledgeBase
 
 SAFETY_TEXT = (
     "Avoid blanket chemical sprays. Prioritize scouting, pheromone traps, and RNAi-based "
@@ -9,6 +11,7 @@ SAFETY_TEXT = (
     "avoids chemical dosage or medical recommendations."
 )
 
+WHY_RNAI = "RNAi targets pest genes precisely, reducing non-target impacts and resistance pressure."
 
 PERSISTENT_PEST_NOTES = {
     "cotton": "Monitor for bollworm and whitefly; use trap-based monitoring first.",
@@ -17,13 +20,48 @@ PERSISTENT_PEST_NOTES = {
 }
 
 
-def explain_pest(pest_or_crop: str) -> Dict[str, str]:
-    """Provide pest management guidance with emphasis on RNAi and safety."""
-    key = (pest_or_crop or "").lower()
-    note = PERSISTENT_PEST_NOTES.get(key, "Emphasize scouting and threshold-based action.")
+def explain_pest(
+    pest_or_crop: str,
+    knowledge_base: Optional[PestKnowledgeBase] = None,
+    crop: Optional[str] = None,
+    month: Optional[str] = None,
+) -> Dict[str, str]:
+    """Provide pest management guidance with emphasis on RNAi and safety.
+
+    With a knowledge base, the question is matched by pest name, symptom, crop and
+    month; otherwise only the built-in per-crop notes are used.
+    """
+    if knowledge_base is not None:
+        matches = knowledge_base.query(pest_or_crop, crop=crop, month=month)
+        if matches:
+            top = matches[0]
+            if knowledge_base.matched_terms(pest_or_crop):
+                topic = top.pest
+                explanation = f"{top.note} Symptoms to look for: {', '.join(top.symptoms)}."
+                others = [entry.pest for entry in matches[1:]]
+                if others:
+                    explanation += f" Related: {', '.join(others)}."
+            else:
+                # Crop-level question: every match shares the crop that was asked about.
+                shared = set(top.crops).intersection(*(entry.crops for entry in matches[1:]))
+                topic = next((name for name in top.crops if name in shared), crop or pest_or_crop)
+                explanation = "Key pests to scout: " + "; ".join(
+                    f"{entry.pest} ({', '.join(entry.symptoms[:2])})" for entry in matches
+                ) + f". {top.note}"
+            return {
+                "topic": topic,
+                "explanation": explanation,
+                "safety": SAFETY_TEXT,
+                "why_rnai": WHY_RNAI,
+            }
+
+    # Without a knowledge-base match the question itself is not a usable key or title;
+    # callers that pass only a crop name still get that crop's notes.
+    topic = crop or pest_or_crop
+    note = PERSISTENT_PEST_NOTES.get((topic or "").lower(), "Emphasize scouting and threshold-based action.")
     return {
-        "topic": pest_or_crop,
+        "topic": topic,
         "explanation": note,
         "safety": SAFETY_TEXT,
-        "why_rnai": "RNAi targets pest genes precisely, reducing non-target impacts and resistance pressure.",
+        "why_rnai": WHY_RNAI,
     }
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from tools.crop_calendar_loader import select_calendar_entry
+from tools.renderer import Renderer, render_tasks
+
+if TYPE_CHECKING:
+    from agents.risk_task_index import RiskTaskIndex
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -32,16 +36,40 @@ def _decorate_task(task: Dict[str, Any], risk_map: Dict[str, Dict[str, Any]]) ->
     }
 
 
+def crop_risk_map(risk_map: Dict[str, Dict[str, Any]], crop: str) -> Dict[str, Dict[str, Any]]:
+    """Month risk map for one crop; per-crop overrides under a month's "crops" are merged into it."""
+    crop_risks = {}
+    for month, info in risk_map.items():
+        base = {key: value for key, value in info.items() if key != "crops"}
+        crop_risks[month] = {**base, **info.get("crops", {}).get(crop, {})}
+    return crop_risks
+
+
+def decorate_tasks(
+    tasks: List[Dict[str, Any]], risk_map: Dict[str, Dict[str, Any]], crop: str
+) -> List[Dict[str, Any]]:
+    """Join one crop's calendar tasks with a state's monthly risk, applying per-crop overrides."""
+    crop_risks = crop_risk_map(risk_map, crop)
+    return [_decorate_task(task, crop_risks) for task in tasks]
+
+
 def generate_plan(
     calendar_data: Dict[str, Any],
     crop: str,
     state: str,
     season: str,
     risk_map: Dict[str, Dict[str, Any]],
+    index: Optional["RiskTaskIndex"] = None,
 ) -> Dict[str, Any]:
-    """Generate a seasonal farm plan with risk-aware tasks."""
+    """Generate a seasonal farm plan with risk-aware tasks.
+
+    When a precomputed ``index`` is given, its joined tasks are used and ``risk_map`` is ignored.
+    """
     try:
-        entries = select_calendar_entry(calendar_data, crop, state, season)
+        if index is not None:
+            entries = index.plan_tasks(crop, state, season)
+        else:
+            entries = select_calendar_entry(calendar_data, crop, state, season)
         if not entries:
             logger.warning(f"No calendar entry for {crop}/{state}/{season}")
             return {
@@ -52,7 +80,7 @@ def generate_plan(
                 "note": f"No matching calendar entry found for {crop} in {state} during {season} season.",
             }
 
-        tasks = [_decorate_task(task, risk_map) for task in entries]
+        tasks = entries if index is not None else decorate_tasks(entries, risk_map, crop)
         logger.info(f"Generated {len(tasks)} tasks for {crop}/{state}/{season}")
         return {
             "crop": crop,
@@ -71,23 +99,20 @@ def generate_plan(
         }
 
 
-def format_tasks(tasks: List[Dict[str, Any]]) -> List[str]:
-    """Format tasks using TASK → WHEN → WHY → HOW → RISK structure."""
-    formatted = []
-    for idx, task in enumerate(tasks, 1):
-        segment = f"**{idx}.** " + " | ".join(
-            [
-                f"**TASK:** {task.get('task','')}",
-                f"**WHEN:** {task.get('when','')}",
-                f"WHY:** {task.get('why','')}",
-                f"**HOW:** {task.get('how','')}",
-                f"**RISK:** {task.get('risk','')}",
-            ]
-        )
-        if task.get("risk_alert"):
-            segment = segment + f" | 🚨 **ALERT:** {task['risk_alert']}"
-        formatted.append(segment)
-    return formatted
+def format_tasks(
+    tasks: List[Dict[str, Any]],
+    locale: str = "en",
+    renderer: Optional[Renderer] = None,
+    plan_key: Optional[Tuple[str, str, str]] = None,
+) -> List[str]:
+    """Format tasks using TASK → WHEN → WHY → HOW → RISK structure.
+
+    With a shared ``renderer`` and the (crop, state, season) ``plan_key`` the tasks
+    came from, the lines are rendered once per data snapshot.
+    """
+    if renderer is not None and plan_key is not None:
+        return list(renderer.plan(plan_key, tasks, locale, "markdown"))
+    return list(render_tasks(tasks, locale, "markdown"))
 
 
 def build_readiness(checklist: Dict[str, Any]) -> Dict[str, Any]:
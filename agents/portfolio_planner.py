@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from agents.planner_agent import build_readiness, generate_plan
+from agents.risk_task_index import MONTHS, RiskTaskIndex
+from tools.weather_api import build_risk_map
+
+logger = logging.getLogger(__name__)
+
+LABOR_WEIGHTS = {"Low": 1.0, "Medium": 2.0, "High": 3.0}
+
+PlanKey = Tuple[str, str, str]
+
+
+class PortfolioPlanner:
+    """Plan a roster of farms, computing each distinct (crop, state, season) plan once.
+
+    ``stream`` yields one result per farm as the roster is consumed, so memory grows
+    with the number of distinct plan keys rather than the number of farms. Plot
+    areas are accumulated per plan key and expanded into monthly labor and
+    irrigation totals only when ``summary`` is called.
+    """
+
+    def __init__(
+        self,
+        calendar_data: Dict[str, Any],
+        weather_data: Dict[str, Any],
+        readiness_defaults: Dict[str, Any],
+        index: Optional[RiskTaskIndex] = None,
+    ) -> None:
+        self.calendar_data = calendar_data
+        self.weather_data = weather_data
+        self.readiness_defaults = readiness_defaults
+        self.index = index
+        self._plans: Dict[PlanKey, Dict[str, Any]] = {}
+        self._area_by_key: Dict[PlanKey, float] = defaultdict(float)
+        self.farm_count = 0
+        self.plot_count = 0
+
+    def plan_for(self, crop: str, state: str, season: str) -> Dict[str, Any]:
+        """Return the shared plan and readiness checklist for one key; callers must not mutate it."""
+        key = (crop, state, season)
+        cached = self._plans.get(key)
+        if cached is None:
+            plan = generate_plan(
+                self.calendar_data, crop, state, season, build_risk_map(self.weather_data, state), index=self.index
+            )
+            readiness = build_readiness(self.readiness_defaults.get(crop, {}).get(state, {}))
+            cached = {
+                "plan": plan,
+                "readiness": readiness,
+                "months": tuple(dict.fromkeys(task["month"] for task in plan["tasks"] if task["month"])),
+            }
+            self._plans[key] = cached
+        return cached
+
+    def stream(self, farms: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield ``{"farm_id", "plots"}`` per farm, each plot carrying its plan and readiness."""
+        for farm in farms:
+            plots = []
+            for plot in farm.get("plots", []):
+                crop, state, season = plot["crop"], plot["state"], plot["season"]
+                area = float(plot.get("area", 1.0))
+                shared = self.plan_for(crop, state, season)
+                self._area_by_key[(crop, state, season)] += area
+                plots.append(
+                    {
+                        "crop": crop,
+                        "state": state,
+                        "season": season,
+                        "area": area,
+                        "plan": shared["plan"],
+                        "readiness": shared["readiness"],
+                    }
+                )
+            self.farm_count += 1
+            self.plot_count += len(plots)
+            yield {"farm_id": farm.get("farm_id"), "plots": plots}
+
+    def summary(self) -> Dict[str, Any]:
+        """Portfolio totals over every farm streamed so far.
+
+        ``labor_by_month`` is area weighted by the checklist's labor intensity
+        (Low=1, Medium=2, High=3); ``irrigation_by_month`` is area per irrigation source.
+        """
+        labor: Dict[str, float] = defaultdict(float)
+        irrigation: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for key, area in self._area_by_key.items():
+            shared = self._plans[key]
+            readiness = shared["readiness"]
+            weight = LABOR_WEIGHTS.get(readiness["Labor intensity"], LABOR_WEIGHTS["Medium"])
+            source = str(readiness["Irrigation dependency"]).split(";")[0].strip()
+            for month in shared["months"]:
+                labor[month] += area * weight
+                irrigation[month][source] += area
+        ordered = [month for month in MONTHS if month in labor]
+        return {
+            "farms": self.farm_count,
+            "plots": self.plot_count,
+            "area": sum(self._area_by_key.values()),
+            "unique_plans": len(self._plans),
+            "labor_by_month": {month: labor[month] for month in ordered},
+            "irrigation_by_month": {month: dict(irrigation[month]) for month in ordered},
+        }
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from tools.renderer import Renderer, render_risks
 from tools.weather_api import build_risk_map, get_month_risk
 
 
@@ -21,11 +22,17 @@ def full_risk_map(state: str, weather_data: Dict[str, Any]) -> Dict[str, Dict[st
     return build_risk_map(weather_data, state)
 
 
-def summarize_risks(risk_map: Dict[str, Dict[str, Any]]) -> List[str]:
-    """Create formatted summary of monthly risks."""
-    summary = []
-    for month, info in risk_map.items():
-        risk_level = info.get('level', 'Medium')
-        emoji = "🟢" if risk_level == "Low" else "🟡" if risk_level == "Medium" else "🔴"
-        summary.append(f"{emoji} **{month}:** {risk_level} | {info.get('alert', '')}")
-    return summary
+def summarize_risks(
+    risk_map: Dict[str, Dict[str, Any]],
+    locale: str = "en",
+    renderer: Optional[Renderer] = None,
+    state: Optional[str] = None,
+) -> List[str]:
+    """Create formatted summary of monthly risks.
+
+    With a shared ``renderer`` and the ``state`` the map belongs to, the lines are
+    rendered once per data snapshot.
+    """
+    if renderer is not None and state is not None:
+        return list(renderer.risks(state, risk_map, locale, "markdown"))
+    return list(render_risks(risk_map, locale, "markdown"))
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from agents.planner_agent import decorate_tasks
+
+logger = logging.getLogger(__name__)
+
+MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+def months_between(start: date, days: int) -> List[str]:
+    """Month names touched by the window [start, start + days], in calendar order."""
+    months: List[str] = []
+    current, end = start.replace(day=1), start + timedelta(days=days)
+    while current <= end:
+        months.append(MONTHS[current.month - 1])
+        current = (current + timedelta(days=32)).replace(day=1)
+    return months
+
+
+class RiskTaskIndex:
+    """Precomputed join of calendar tasks with weather risk, keyed by (state, month).
+
+    Every (crop, state, season) plan is decorated once up front. When one state's
+    weather changes, ``update_state`` re-joins only that state's tasks.
+    """
+
+    def __init__(self, calendar_data: Dict[str, Any], weather_data: Dict[str, Any]) -> None:
+        self._weather: Dict[str, Dict[str, Any]] = {state: dict(months) for state, months in weather_data.items()}
+        self._calendar: Dict[str, List[Tuple[str, str, List[Dict[str, Any]]]]] = {}
+        for crop, states in calendar_data.items():
+            for state, seasons in states.items():
+                for season, tasks in seasons.items():
+                    self._calendar.setdefault(state, []).append((crop, season, tasks or []))
+        self._plans: Dict[str, Dict[Tuple[str, str], List[Dict[str, Any]]]] = {}
+        self._by_month: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for state in self._calendar:
+            self._join_state(state)
+
+    def _join_state(self, state: str) -> int:
+        state_weather = self._weather.get(state, {})
+        plans: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        by_month: Dict[str, List[Dict[str, Any]]] = {}
+        count = 0
+        for crop, season, tasks in self._calendar.get(state, []):
+            decorated = decorate_tasks(tasks, state_weather, crop)
+            plans[(crop, season)] = decorated
+            for task in decorated:
+                by_month.setdefault(task["month"], []).append({"crop": crop, "season": season, **task})
+            count += len(decorated)
+        # Swap in whole per-state tables so readers never see a half-updated state.
+        self._plans[state] = plans
+        self._by_month[state] = by_month
+        return count
+
+    def update_state(self, state: str, state_weather: Dict[str, Any]) -> int:
+        """Replace one state's monthly weather and re-join its tasks; returns tasks refreshed."""
+        self._weather[state] = dict(state_weather)
+        count = self._join_state(state)
+        logger.info(f"Re-joined {count} tasks for {state}")
+        return count
+
+    def plan_tasks(self, crop: str, state: str, season: str) -> Optional[List[Dict[str, Any]]]:
+        tasks = self._plans.get(state, {}).get((crop, season))
+        if tasks is None:
+            return None
+        return [dict(task) for task in tasks]
+
+    def tasks_in_months(
+        self, state: str, months: Iterable[str], levels: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """All crops' tasks in ``state`` for the given months, optionally filtered by risk level."""
+        wanted = set(levels) if levels is not None else None
+        by_month = self._by_month.get(state, {})
+        return [
+            dict(task)
+            for month in months
+            for task in by_month.get(month, [])
+            if wanted is None or task["risk"] in wanted
+        ]
+
+    def tasks_in_window(
+        self, state: str, start: date, days: int = 60, levels: Optional[Iterable[str]] = ("High",)
+    ) -> List[Dict[str, Any]]:
+        """Tasks in months overlapping the next ``days`` days, e.g. all High-risk work coming up."""
+        return self.tasks_in_months(state, months_between(start, days), levels)
@@ -5,6 +5,8 @@ from typing import Any, Dict, Optional
 
 import requests
 
+from memory.route_cache import SemanticRouteCache
+
 PROMPT_TEMPLATE = """
 You are the Supervisor Agent for a farm advisory demo. Read the user input and decide the intent.
 Always return valid JSON with keys: intent, agent, reason.
@@ -22,10 +24,12 @@ class SupervisorAgent:
         model: str = "phi3:mini",
         endpoint: str = "http://localhost:11434/api/chat",
         mock: bool = False,
+        cache: Optional[SemanticRouteCache] = None,
     ) -> None:
         self.model = model
         self.endpoint = endpoint
         self.mock = mock
+        self.cache = cache
 
     def _ollama_chat(self, prompt: str) -> Optional[str]:
         payload = {
@@ -66,6 +70,11 @@ class SupervisorAgent:
         if self.mock:
             return self._fallback_route(user_input)
 
+        if self.cache is not None:
+            cached = self.cache.lookup(user_input)
+            if cached:
+                return cached
+
         prompt = PROMPT_TEMPLATE + "\nUser input:" + user_input + "\nContext:" + json.dumps(context)
         result = self._ollama_chat(prompt)
         if not result:
@@ -74,7 +83,11 @@ class SupervisorAgent:
         try:
             parsed = json.loads(result)
             if {"intent", "agent", "reason"}.issubset(parsed):
-                return {"intent": parsed["intent"], "agent": parsed["agent"], "reason": parsed["reason"]}
+                route = {"intent": parsed["intent"], "agent": parsed["agent"], "reason": parsed["reason"]}
+                # Only LLM decisions are cached; fallback routes are cheap and may be stale once Ollama is back.
+                if self.cache is not None:
+                    self.cache.store(user_input, route)
+                return route
         except json.JSONDecodeError:
             pass
         return self._fallback_route(user_input)
@@ -0,0 +1,59 @@
+"""Guardrail evaluation latency as policies grow to thousands of rules.
+
+Each synthetic policy carries one regex rule per ten keyword rules, each anchored on a
+random word plus a numeric part, alongside the built-in dosage regex.
+
+Run: python -m benchmarks.bench_guardrail_policy
+"""
+
+import random
+import statistics
+import time
+
+from guardrails.policy import PolicyEngine
+from guardrails.safety import DEFAULT_POLICY
+
+PROMPTS = [
+    "Plan Kharif rice in Tamil Nadu and tell me when to transplant",
+    "Which disease-resistant variety suits late sowing in Punjab?",
+    "What pesticide dose should I spray at 5 ml per litre on cotton?",
+    "Check weather alerts for Maharashtra cotton season before picking",
+]
+
+
+def synthetic_document(n_rules: int, seed: int = 3):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    categories = {category: list(terms) for category, terms in DEFAULT_POLICY["categories"].items()}
+    for i in range(n_rules):
+        words = ["".join(rng.choices(letters, k=rng.randint(5, 9))) for _ in range(rng.randint(1, 3))]
+        categories.setdefault(f"category{i % 20}", []).append(" ".join(words))
+    regex = list(DEFAULT_POLICY["regex"])
+    for i in range(n_rules // 10):
+        word = "".join(rng.choices(letters, k=rng.randint(5, 9)))
+        regex.append({"category": f"category{i % 20}", "pattern": rf"\b{word}s?\s+\d+(?:\.\d+)?\s*(?:kg|g|units?)\b"})
+    policy = {**DEFAULT_POLICY, "categories": categories, "regex": regex}
+    return {"version": str(n_rules), "policies": [policy]}
+
+
+def main() -> None:
+    for n_rules in (100, 1_000, 10_000, 50_000):
+        engine = PolicyEngine(synthetic_document(n_rules))
+        start = time.perf_counter()
+        engine.compiled("default")
+        compile_ms = (time.perf_counter() - start) * 1000
+        samples = []
+        for _ in range(200):
+            for prompt in PROMPTS:
+                start = time.perf_counter()
+                engine.evaluate(prompt)
+                samples.append((time.perf_counter() - start) * 1_000_000)
+        samples.sort()
+        print(
+            f"{n_rules:>6} rules + {n_rules // 10:>5} regex | compile {compile_ms:7.1f} ms | "
+            f"evaluate p50 {statistics.median(samples):6.1f} us p95 {samples[int(len(samples) * 0.95)]:6.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Latency benchmark for the pest knowledge base at large catalog sizes.
+
+Run: python -m benchmarks.bench_pest_knowledge
+"""
+
+import random
+import statistics
+import time
+
+from tools.pest_knowledge import MONTHS, PestKnowledgeBase
+
+SYLLABLES = ["bo", "ll", "wor", "stem", "bor", "er", "leaf", "fol", "der", "thri", "ps", "mi", "dge", "hop", "per"]
+CROPS = ["Crop" + chr(ord("a") + i) for i in range(26)]
+STATES = [f"State{i}" for i in range(30)]
+
+
+def _letters(n: int) -> str:
+    """Spell an integer in base-26 letters; the tokenizer drops digits."""
+    out = ""
+    while True:
+        n, rem = divmod(n, 26)
+        out = chr(ord("a") + rem) + out
+        if not n:
+            return out
+
+
+SYMPTOM_WORDS = ["symptom" + _letters(i) for i in range(2000)]
+
+
+def synthetic_catalog(size: int, seed: int = 7):
+    rng = random.Random(seed)
+    months = sorted(m.title() for m in MONTHS)
+    for i in range(size):
+        name = "".join(rng.choices(SYLLABLES, k=3)) + _letters(i)
+        yield {
+            "pest": f"{name} pest",
+            "crops": rng.sample(CROPS, 2),
+            "states": rng.sample(STATES, 3),
+            "months": rng.sample(months, 4),
+            "symptoms": [" ".join(rng.sample(SYMPTOM_WORDS, 2)) for _ in range(3)],
+            "note": "Scout regularly.",
+        }
+
+
+def _timed(fn, queries):
+    samples = []
+    for args in queries:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95)]
+
+
+def run(size: int, n_queries: int = 500) -> None:
+    records = list(synthetic_catalog(size))
+    start = time.perf_counter()
+    kb = PestKnowledgeBase(records)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    rng = random.Random(size)
+    queries = []
+    for _ in range(n_queries):
+        record = rng.choice(records)
+        kind = rng.random()
+        if kind < 0.4:
+            text = record["pest"].split()[0]
+        elif kind < 0.7:
+            text = record["symptoms"][0]
+        else:
+            text = record["pest"].split()[0][:-1] + "x"  # misspelling
+        queries.append((text, record["crops"][0], None, record["months"][0]))
+
+    cold = _timed(lambda *q: kb.query(*q), queries)
+    warm = _timed(lambda *q: kb.query(*q), queries)
+    print(
+        f"{size:>7} entries | build {build_ms:8.1f} ms | cold p50 {cold[0]:.3f} ms p95 {cold[1]:.3f} ms"
+        f" | cached p50 {warm[0]:.4f} ms p95 {warm[1]:.4f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for size in (1_000, 10_000, 50_000):
+        run(size)
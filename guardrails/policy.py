@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+def _indic_word_chars() -> str:
+    """Character-class ranges for the letters, combining marks and digits of the Indic blocks.
+
+    Vowel signs are combining marks, which \\w does not match; punctuation such as the
+    danda (।) is left out so it separates words.
+    """
+    ranges: List[Tuple[int, int]] = []
+    for code in range(0x0900, 0x0D80):
+        if unicodedata.category(chr(code))[0] in "LMN":
+            if ranges and ranges[-1][1] == code - 1:
+                ranges[-1] = (ranges[-1][0], code)
+            else:
+                ranges.append((code, code))
+    return "".join(f"\\u{first:04x}-\\u{last:04x}" for first, last in ranges)
+
+
+# Latin words plus words in the Indic script blocks (Devanagari through Malayalam).
+TOKEN_PATTERN = re.compile(rf"[\w{_indic_word_chars()}]+")
+
+try:  # Python 3.11+
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+Phrase = Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class PolicyMatch:
+    category: str
+    term: str
+    rule_type: str  # "keyword" or "regex"
+
+
+@dataclass(frozen=True)
+class Verdict:
+    allowed: bool
+    policy: str
+    version: str
+    matches: Tuple[PolicyMatch, ...] = ()
+    message: str = ""
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(match.category for match in self.matches))
+
+
+def load_policies(path: Path) -> Dict[str, Any]:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _tokens(text: str) -> List[Tuple[str, int, int]]:
+    return [(m.group(0), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text.lower())]
+
+
+def _phrase(term: str) -> Phrase:
+    return tuple(token for token, _, _ in _tokens(term))
+
+
+def _required_literal(pattern: str) -> str:
+    """Longest literal every match of ``pattern`` must contain (casefolded), or "" if none of 3+ chars."""
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except (re.error, RecursionError):
+        return ""
+    literals: List[str] = []
+
+    def walk(items) -> None:
+        run: List[str] = []
+        for op, av in items:
+            if op is sre_parse.LITERAL:
+                run.append(chr(av))
+                continue
+            literals.append("".join(run))
+            run = []
+            if op is sre_parse.SUBPATTERN:
+                walk(av[-1])
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, sre_parse.POSSESSIVE_REPEAT) and av[0] >= 1:
+                walk(av[2])
+        literals.append("".join(run))
+
+    walk(parsed)
+    best = max(literals, key=len, default="").casefold()
+    return best if len(best) >= 3 else ""
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _substrings(token: str, max_len: int) -> List[str]:
+    return [token[i:j] for i in range(len(token)) for j in range(i + 1, min(len(token), i + max_len) + 1)]
+
+
+class CompiledPolicy:
+    """A policy flattened into hash tables of token phrases plus prefiltered regex rules.
+
+    Keyword rules match inside words, like a substring check on the text, so
+    inflections ("pesticides", "பூச்சிக்கொல்லிகள்") and compounds ("biopesticide",
+    "agrochemical spray") are caught in every script; words that merely contain a rule,
+    such as "secure", belong on the allowlist. Evaluation probes the substrings of each
+    word (up to the longest rule word) in hash tables, so its cost depends on input
+    length, not rule count. Regex rules run only when the input contains a literal they require.
+    """
+
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        self.name: str = spec["name"]
+        self.version: str = str(spec.get("version", ""))
+        self.notice: str = spec.get("notice", "")
+        self.keywords: Dict[Phrase, Tuple[str, str]] = {}
+        for category, terms in spec.get("categories", {}).items():
+            for term in terms:
+                phrase = _phrase(term)
+                if phrase:
+                    self.keywords.setdefault(phrase, (category, term))
+        self.max_keyword = max((len(p) for p in self.keywords), default=0)
+        self.max_word = max((len(word) for p in self.keywords for word in p), default=0)
+        # A multi-word rule may start at the end of one word and end at the start of another.
+        self.first_words = frozenset(p[0] for p in self.keywords if len(p) > 1)
+        self.last_words = frozenset(p[-1] for p in self.keywords if len(p) > 1)
+        self.allow: FrozenSet[Phrase] = frozenset(filter(None, (_phrase(term) for term in spec.get("allow", []))))
+        self.max_allow = max((len(p) for p in self.allow), default=0)
+        self.regex_rules: List[Tuple[str, str]] = [(rule["category"], rule["pattern"]) for rule in spec.get("regex", [])]
+        # Regex rules with a required literal are bucketed by that literal's rarest trigram
+        # and only run when the input contains the literal; the rest share one alternation.
+        self.regex = None
+        self.regex_buckets: Dict[str, List[Tuple[int, str, "re.Pattern[str]"]]] = {}
+        literals = [_required_literal(pattern) for _, pattern in self.regex_rules]
+        trigram_counts = Counter(gram for literal in literals for gram in _trigrams(literal))
+        unfiltered: List[int] = []
+        for i, ((_, pattern), literal) in enumerate(zip(self.regex_rules, literals)):
+            if not literal:
+                unfiltered.append(i)
+                continue
+            key = min(sorted(_trigrams(literal)), key=trigram_counts.__getitem__)
+            self.regex_buckets.setdefault(key, []).append((i, literal, re.compile(pattern, re.IGNORECASE)))
+        if unfiltered:
+            self.regex = re.compile(
+                "|".join(f"(?P<r{i}>{self.regex_rules[i][1]})" for i in unfiltered), re.IGNORECASE
+            )
+
+    def evaluate(self, text: str) -> Verdict:
+        tokens = _tokens(text or "")
+        words = [token for token, _, _ in tokens]
+        allowed_at = [False] * len(words)
+        allowed_spans: List[Tuple[int, int]] = []
+        for i in range(len(words)):
+            for n in range(min(self.max_allow, len(words) - i), 0, -1):
+                if tuple(words[i : i + n]) in self.allow:
+                    for j in range(i, i + n):
+                        allowed_at[j] = True
+                    allowed_spans.append((tokens[i][1], tokens[i + n - 1][2]))
+                    break
+
+        matches: List[PolicyMatch] = []
+        for i, word in enumerate(words):
+            if allowed_at[i]:
+                continue
+            hits = (self.keywords.get((part,)) for part in _substrings(word, self.max_word))
+            matches.extend(
+                PolicyMatch(category=hit[0], term=hit[1], rule_type="keyword") for hit in dict.fromkeys(filter(None, hits))
+            )
+            if self.max_keyword < 2:
+                continue
+            starts = [word[k:] for k in range(len(word)) if word[k:] in self.first_words]
+            for n in range(2, min(self.max_keyword, len(words) - i) + 1):
+                if not starts or any(allowed_at[i : i + n]):
+                    break
+                middle = tuple(words[i + 1 : i + n - 1])
+                last = words[i + n - 1]
+                ends = [last[:k] for k in range(1, len(last) + 1) if last[:k] in self.last_words]
+                for start in starts:
+                    for end in ends:
+                        hit = self.keywords.get((start,) + middle + (end,))
+                        if hit:
+                            matches.append(PolicyMatch(category=hit[0], term=hit[1], rule_type="keyword"))
+
+        found: List[Tuple[int, int, "re.Match[str]"]] = []
+        if self.regex is not None:
+            found.extend((m.start(), int(m.lastgroup[1:]), m) for m in self.regex.finditer(text or ""))
+        if self.regex_buckets:
+            folded = (text or "").casefold()
+            for gram in _trigrams(folded):
+                for i, literal, pattern in self.regex_buckets.get(gram, ()):
+                    if literal in folded:
+                        found.extend((m.start(), i, m) for m in pattern.finditer(text))
+        for _, i, m in sorted(found, key=lambda item: item[:2]):
+            if any(start <= m.start() and m.end() <= end for start, end in allowed_spans):
+                continue
+            matches.append(PolicyMatch(category=self.regex_rules[i][0], term=m.group(0), rule_type="regex"))
+
+        return Verdict(
+            allowed=not matches,
+            policy=self.name,
+            version=self.version,
+            matches=tuple(matches),
+            message=self.notice if matches else "",
+        )
+
+
+class PolicyEngine:
+    """Select the policies for a (state, language) and evaluate text against their compiled forms.
+
+    Policies may ``extend`` another policy, inheriting its categories, allowlist,
+    regex rules and notice. Compiled policies are cached by (name, version), so
+    reloading an unchanged policy document reuses them.
+    """
+
+    def __init__(self, document: Dict[str, Any]) -> None:
+        self._lock = threading.Lock()
+        self._compiled: Dict[Tuple[str, str], CompiledPolicy] = {}
+        self.load(document)
+
+    def load(self, document: Dict[str, Any]) -> None:
+        default_version = str(document.get("version", ""))
+        raw = {spec["name"]: spec for spec in document.get("policies", [])}
+        specs = {name: self._resolve(name, raw, default_version) for name in raw}
+        selectors = {(spec.get("state"), spec.get("language")): name for name, spec in specs.items()}
+        with self._lock:
+            live = {(name, str(spec.get("version", ""))) for name, spec in specs.items()}
+            self._compiled = {key: policy for key, policy in self._compiled.items() if key in live}
+            self._specs = specs
+            self._selectors = selectors
+
+    def _resolve(self, name: str, raw: Dict[str, Dict[str, Any]], default_version: str) -> Dict[str, Any]:
+        spec = dict(raw[name])
+        spec.setdefault("version", default_version)
+        parent_name = spec.pop("extends", None)
+        if parent_name is None:
+            return spec
+        parent = self._resolve(parent_name, raw, default_version)
+        categories = {category: list(terms) for category, terms in parent.get("categories", {}).items()}
+        for category, terms in spec.get("categories", {}).items():
+            categories.setdefault(category, []).extend(terms)
+        return {
+            **spec,
+            "categories": categories,
+            "allow": list(parent.get("allow", [])) + list(spec.get("allow", [])),
+            "regex": list(parent.get("regex", [])) + list(spec.get("regex", [])),
+            "notice": spec.get("notice", parent.get("notice", "")),
+            # A child's effective version changes whenever its parent's does.
+            "version": f"{spec['version']}+{parent['version']}",
+        }
+
+    def select(self, state: Optional[str] = None, language: Optional[str] = None) -> Tuple[str, ...]:
+        """Names of the policies that apply to a (state, language) request.
+
+        A policy declared for exactly that pair wins. Otherwise the language policy and
+        the state policy both apply, language first so its notice is the one shown,
+        and only when neither exists does the default policy apply on its own.
+        """
+        exact = self._selectors.get((state, language))
+        if exact is not None:
+            return (exact,)
+        candidates = (
+            self._selectors.get((None, language)) if language is not None else None,
+            self._selectors.get((state, None)) if state is not None else None,
+        )
+        names = tuple(dict.fromkeys(name for name in candidates if name is not None))
+        if names:
+            return names
+        default = self._selectors.get((None, None))
+        if default is None:
+            raise KeyError("No default policy (without state or language) is defined")
+        return (default,)
+
+    def compiled(self, name: str) -> CompiledPolicy:
+        spec = self._specs[name]
+        key = (name, str(spec.get("version", "")))
+        with self._lock:
+            policy = self._compiled.get(key)
+            if policy is None:
+                policy = CompiledPolicy(spec)
+                self._compiled[key] = policy
+        return policy
+
+    def evaluate(self, text: str, state: Optional[str] = None, language: Optional[str] = None) -> Verdict:
+        verdicts = [self.compiled(name).evaluate(text) for name in self.select(state, language)]
+        if len(verdicts) == 1:
+            return verdicts[0]
+        # Stacked policies share their base rules, so the same match can be reported twice.
+        matches = tuple(dict.fromkeys(match for verdict in verdicts for match in verdict.matches))
+        return Verdict(
+            allowed=not matches,
+            policy="+".join(verdict.policy for verdict in verdicts),
+            version=",".join(verdict.version for verdict in verdicts),
+            matches=matches,
+            message=next((verdict.message for verdict in verdicts if verdict.message), ""),
+        )
+
+    @property
+    def policy_names(self) -> Iterable[str]:
+        return tuple(self._specs)
@@ -1,51 +1,116 @@
 from __future__ import annotations
 
-BLOCKED_KEYWORDS = [
-    # Medical/Health
-    "medical advice",
-    "prescription",
-    "doctor",
-    "cure",
-    "treat",
-    "disease",
-    
-    # Chemical/Pesticide dosing
-    "dosage",
-    "dose",
-    "ml per",
-    "kg per",
-    "chemical spray",
-    "pesticide",
-    "insecticide",
-    "herbicide",
-    "fungicide",
-    "poison",
-    
-    # Illegal activity
-    "illicit",
-    "illegal",
-    "contraband",
-    "narcotic",
-    "smuggle",
-    "steal",
-    "black market",
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from guardrails.policy import PolicyEngine, Verdict, load_policies
+
+POLICY_PATH = Path(__file__).resolve().parents[1] / "data" / "guardrail_policies.json"
+POLICY_VERSION = "1"
+
+BLOCKED_CATEGORIES = {
+    "medical": [
+        "medical advice",
+        "prescription",
+        "doctor",
+        "cure",
+        "treat",
+        "disease",
+    ],
+    "chemical": [
+        "dosage",
+        "dose",
+        "ml per",
+        "kg per",
+        "chemical spray",
+        "pesticide",
+        "insecticide",
+        "herbicide",
+        "fungicide",
+        "poison",
+    ],
+    "illegal": [
+        "illicit",
+        "illegal",
+        "contraband",
+        "narcotic",
+        "smuggle",
+        "steal",
+        "black market",
+    ],
+}
+
+BLOCKED_KEYWORDS = [keyword for keywords in BLOCKED_CATEGORIES.values() for keyword in keywords]
+
+# Safe words and agronomy phrases that contain a blocked word (rules match inside words).
+ALLOWED_PHRASES = [
+    "disease-resistant variety",
+    "disease resistant",
+    "disease resistance",
+    "disease-free seed",
+    "secure",
+    "security",
+    "procure",
+    "procurement",
+    "treaty",
+    "retreat",
 ]
 
+# Numeric application rates such as "5 ml per litre" or "2kg/acre".
+DOSAGE_PATTERN = r"\b\d+(?:\.\d+)?\s*(?:ml|l|g|gm|kg|litres?|liters?)\s*(?:per|/)\s*(?:acre|ha|hectare|litre|liter|l|pump|tank)\b"
+
+# Unicode blocks of the scripts that have language policies: Devanagari (Hindi), Tamil.
+SCRIPT_LANGUAGES = {"hi": ("\u0900", "\u097f"), "ta": ("\u0b80", "\u0bff")}
+
 SAFETY_NOTICE = (
     "This system provides advisory guidance only and does not give medical or chemical "
     "dosage instructions. Consult local agronomists or authorities for restricted topics."
 )
 
 
-def is_safe(text: str) -> bool:
+DEFAULT_POLICY = {
+    "name": "default",
+    "version": POLICY_VERSION,
+    "categories": BLOCKED_CATEGORIES,
+    "allow": ALLOWED_PHRASES,
+    "regex": [{"category": "chemical", "pattern": DOSAGE_PATTERN}],
+    "notice": SAFETY_NOTICE,
+}
+
+
+@lru_cache(maxsize=1)
+def get_policy_engine() -> PolicyEngine:
+    """Engine with the built-in default policy plus regional/language policies from data/."""
+    document = load_policies(POLICY_PATH) if POLICY_PATH.exists() else {}
+    policies = [DEFAULT_POLICY] + [p for p in document.get("policies", []) if p.get("name") != "default"]
+    return PolicyEngine({"version": document.get("version", POLICY_VERSION), "policies": policies})
+
+
+def detect_language(text: str) -> Optional[str]:
+    """Language of the policy-covered script most used in text, or None (e.g. for English)."""
+    counts = Counter(
+        language
+        for char in text or ""
+        for language, (first, last) in SCRIPT_LANGUAGES.items()
+        if first <= char <= last
+    )
+    return counts.most_common(1)[0][0] if counts else None
+
+
+def evaluate_safety(text: str, state: Optional[str] = None, language: Optional[str] = None) -> Verdict:
+    """Return the structured verdict of the policy for this state/language."""
+    return get_policy_engine().evaluate(text or "", state=state, language=language)
+
+
+def is_safe(text: str, state: Optional[str] = None, language: Optional[str] = None) -> bool:
     if not text:
         return True
-    lowered = text.lower()
-    return not any(keyword in lowered for keyword in BLOCKED_KEYWORDS)
+    return evaluate_safety(text, state, language).allowed
 
 
-def enforce_safety(text: str) -> tuple[bool, str]:
+def enforce_safety(text: str, state: Optional[str] = None, language: Optional[str] = None) -> tuple[bool, str]:
     """Return (allowed, message)."""
-    if is_safe(text):
-        return True, ""
-    return False, SAFETY_NOTICE
+    verdict = evaluate_safety(text, state, language)
+    return verdict.allowed, verdict.message
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class AuditSink:
+    """Append-only audit trail written by a background thread.
+
+    ``record`` only enqueues onto a bounded queue and never blocks; when the queue
+    is full the event is dropped and counted. The writer drains events in batches,
+    appends each batch as one gzip member to the current ``*.jsonl.gz`` segment and
+    fsyncs once per batch. A new segment starts once the current one reaches
+    ``segment_max_bytes`` of compressed data, or after a failed write, which is
+    retried once there; a batch that fails both times is counted as dropped.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        segment_max_bytes: int = 8 * 1024 * 1024,
+        prefix: str = "audit",
+        start: bool = True,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.segment_max_bytes = segment_max_bytes
+        self.prefix = prefix
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._segment: Optional[Path] = None
+        self._segment_bytes = 0
+        self._segment_seq = 0
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.write_errors = 0
+        if start:
+            self.start()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def record(self, event: Dict[str, Any]) -> bool:
+        """Queue an event for writing; returns False if it was dropped under overload.
+
+        The event is serialised on the writer thread, so callers must not mutate it afterwards.
+        """
+        event.setdefault("ts", time.time())
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the writer after it drains everything already queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            stopping = self._stop.is_set()
+            try:
+                batch = [self._queue.get_nowait() if stopping else self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                if stopping:
+                    return
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _next_segment(self) -> Path:
+        self._segment_seq += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return self.directory / f"{self.prefix}-{stamp}-{os.getpid()}-{self._segment_seq:04d}.jsonl.gz"
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(event, ensure_ascii=False, default=str) + "\n" for event in batch)
+        payload = gzip.compress(lines.encode("utf-8"))
+        for attempt in range(2):
+            # A failed append may leave a partial gzip member behind, so a retry starts a fresh segment.
+            if attempt or self._segment is None or self._segment_bytes >= self.segment_max_bytes:
+                self._segment = self._next_segment()
+                self._segment_bytes = 0
+            try:
+                with self._segment.open("ab") as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError:
+                with self._lock:
+                    self.write_errors += 1
+                continue
+            self._segment_bytes += len(payload)
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+            return
+        with self._lock:
+            self.dropped += len(batch)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "batches": self.batches,
+                "write_errors": self.write_errors,
+                "queue_depth": self._queue.qsize(),
+                "segments": self._segment_seq,
+            }
+
+
+def read_audit_log(directory: Path, prefix: str = "audit") -> Iterator[Dict[str, Any]]:
+    """Yield events from every segment in ``directory``, oldest segment first."""
+    for path in sorted(Path(directory).glob(f"{prefix}-*.jsonl.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Intent synonyms folded together so paraphrases share word features.
+ALIASES = {
+    "plan": "schedule",
+    "planning": "schedule",
+    "calendar": "schedule",
+}
+
+# Routing depends on what is asked, not on which crop, place or season it is asked
+# about, so these words (and filler) are dropped before embedding. Otherwise shared
+# context dominates the vector and "weather risk for kharif cotton in maharashtra"
+# looks like "pest risk for kharif cotton in maharashtra".
+CONTEXT_WORDS = {
+    "rice", "paddy", "wheat", "cotton", "kharif", "rabi", "zaid", "season", "crop", "crops",
+    "tamil", "nadu", "tn", "punjab", "pb", "maharashtra", "mh",
+    "january", "february", "march", "april", "may", "june", "july", "august",
+    "september", "october", "november", "december", "month", "week", "year",
+}
+STOPWORDS = {
+    "a", "about", "advice", "all", "an", "and", "any", "are", "at", "be", "best", "by", "can", "could",
+    "current", "do", "does", "for", "from", "get", "give", "guide", "help", "how", "i", "in", "info", "is",
+    "it", "know", "latest", "me", "my", "need", "next", "now", "of", "on", "our", "please", "safely",
+    "should", "show", "some", "tell", "that", "the", "this", "tip", "tips", "to", "today", "upcoming",
+    "us", "want", "way", "we", "what", "when", "which", "will", "with", "would", "you", "your",
+}
+
+# Norm of a word's trigram features relative to its unigram (1.0).
+TRIGRAM_SHARE = 0.5
+
+SparseVector = Dict[int, float]
+
+
+def _singular(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def _tokens(text: str) -> List[str]:
+    words = TOKEN_PATTERN.findall((text or "").lower())
+    return [
+        ALIASES.get(word, _singular(word)) for word in words if word not in CONTEXT_WORDS and word not in STOPWORDS
+    ]
+
+
+def _bucket(feature: str, n_features: int) -> int:
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % n_features
+
+
+def embed(text: str, n_features: int = 1 << 18) -> SparseVector:
+    """Embed the intent words of text as an L2-normalised hashed vector of word unigrams and character trigrams.
+
+    Each distinct word contributes a unit-length sub-vector, its unigram carrying most of
+    the weight and its trigrams sharing the rest, so every word counts about equally and
+    a short intent word ("pest") is not swamped by a long shared one ("calendar").
+    Word order is ignored; trigrams tolerate small spelling differences.
+    """
+    vector: SparseVector = {}
+    for word in dict.fromkeys(_tokens(text)):
+        padded = f"#{word}#"
+        trigrams = [padded[i : i + 3] for i in range(len(padded) - 2)]
+        trigram_weight = TRIGRAM_SHARE / math.sqrt(len(trigrams))
+        features = [("w:" + word, 1.0)] + [("c:" + gram, trigram_weight) for gram in trigrams]
+        norm = math.sqrt(1.0 + TRIGRAM_SHARE * TRIGRAM_SHARE)
+        for feature, weight in features:
+            index = _bucket(feature, n_features)
+            vector[index] = vector.get(index, 0.0) + weight / norm
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    if not norm:
+        return {}
+    return {index: value / norm for index, value in vector.items()}
+
+
+def cosine(a: SparseVector, b: SparseVector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(value * b.get(index, 0.0) for index, value in a.items())
+
+
+class SemanticRouteCache:
+    """Bounded nearest-neighbour cache of supervisor routes keyed by embedded input.
+
+    An inverted index from vector buckets to cached entries limits each lookup to
+    entries sharing at least one feature with the query. Least recently used entries
+    are evicted once ``max_entries`` is reached.
+
+    With every word weighted equally, texts sharing k of their words score about
+    k / sqrt(len(a) * len(b)): adding one word to a two-word intent gives 0.82 and to a
+    three-word intent 0.87. The default threshold sits above both, so an extra intent
+    word ("pest calendar", "weather risk pest") misses and the LLM decides; the cost is
+    that misspelt paraphrases miss too.
+    """
+
+    def __init__(self, max_entries: int = 512, threshold: float = 0.9, n_features: int = 1 << 18) -> None:
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.n_features = n_features
+        self._entries: "OrderedDict[int, Tuple[SparseVector, Dict[str, str]]]" = OrderedDict()
+        self._postings: Dict[int, Set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lookup_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, text: str) -> Optional[Dict[str, str]]:
+        """Return a copy of the closest cached route if it clears the similarity threshold."""
+        start = time.perf_counter()
+        query = embed(text, self.n_features)
+        with self._lock:
+            best_id, best_score = None, 0.0
+            candidates: Set[int] = set()
+            for index in query:
+                candidates.update(self._postings.get(index, ()))
+            for entry_id in candidates:
+                score = cosine(query, self._entries[entry_id][0])
+                if score > best_score:
+                    best_id, best_score = entry_id, score
+            if best_id is not None and best_score >= self.threshold:
+                self._entries.move_to_end(best_id)
+                self.hits += 1
+                route = dict(self._entries[best_id][1])
+            else:
+                self.misses += 1
+                route = None
+            self._lookup_seconds += time.perf_counter() - start
+        return route
+
+    def store(self, text: str, route: Dict[str, str]) -> None:
+        vector = embed(text, self.n_features)
+        if not vector:
+            return
+        with self._lock:
+            while len(self._entries) >= self.max_entries:
+                self._evict_oldest()
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (vector, dict(route))
+            for index in vector:
+                self._postings.setdefault(index, set()).add(entry_id)
+
+    def _evict_oldest(self) -> None:
+        entry_id, (vector, _) = self._entries.popitem(last=False)
+        for index in vector:
+            bucket = self._postings.get(index)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._postings[index]
+        self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "avg_lookup_ms": 1000 * self._lookup_seconds / lookups if lookups else 0.0,
+            }
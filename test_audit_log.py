@@ -0,0 +1,69 @@
+"""Unit tests for the asynchronous audit log."""
+
+import tempfile
+from pathlib import Path
+
+from memory.audit_log import AuditSink, read_audit_log
+
+
+def test_events_written_in_batches():
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = AuditSink(Path(tmp), batch_size=10, flush_interval=0.05)
+        for i in range(25):
+            assert sink.record({"event": "route", "input": f"query {i}"})
+        sink.close()
+        events = list(read_audit_log(Path(tmp)))
+        assert [e["input"] for e in events] == [f"query {i}" for i in range(25)]
+        assert all("ts" in e for e in events)
+        stats = sink.stats()
+        assert stats["written"] == 25 and stats["dropped"] == 0
+        print(f"✓ Audit log wrote {stats['written']} events in {stats['batches']} batches")
+
+
+def test_overload_drops_instead_of_blocking():
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = AuditSink(Path(tmp), max_queue=2, start=False)
+        accepted = [sink.record({"event": "route", "n": i}) for i in range(5)]
+        assert accepted == [True, True, False, False, False]
+        assert sink.stats()["dropped"] == 3
+        sink.start()
+        sink.close()
+        assert len(list(read_audit_log(Path(tmp)))) == 2
+        print("✓ Audit log drops under overload")
+
+
+def test_segments_rotate():
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = AuditSink(Path(tmp), batch_size=1, segment_max_bytes=1, start=False)
+        for i in range(3):
+            sink.record({"event": "route", "n": i})
+        sink.start()
+        sink.close()
+        assert len(list(Path(tmp).glob("audit-*.jsonl.gz"))) == 3
+        assert [e["n"] for e in read_audit_log(Path(tmp))] == [0, 1, 2]
+        print("✓ Audit segments rotate")
+
+
+def test_failed_write_rolls_segment_then_counts_drops():
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = AuditSink(Path(tmp), start=False)
+        blocked = Path(tmp) / "unwritable"
+        blocked.mkdir()
+        sink._segment = blocked
+        sink._write([{"event": "route", "n": 0}])
+        assert [e["n"] for e in read_audit_log(Path(tmp))] == [0]
+        sink._segment = blocked
+        sink._next_segment = lambda: blocked
+        sink._write([{"event": "route", "n": 1}, {"event": "route", "n": 2}])
+        stats = sink.stats()
+        assert stats["written"] == 1 and stats["dropped"] == 2 and stats["write_errors"] == 3
+        print(f"✓ Audit write failures: {stats}")
+
+
+if __name__ == "__main__":
+    print("Running audit log tests...\n")
+    test_events_written_in_batches()
+    test_overload_drops_instead_of_blocking()
+    test_segments_rotate()
+    test_failed_write_rolls_segment_then_counts_drops()
+    print("\n✅ All tests passed!")
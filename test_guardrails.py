@@ -1,7 +1,8 @@
 """Unit tests for guardrails module."""
 
 from guardrails.pii import contains_pii, mask_pii, redact_and_flag
-from guardrails.safety import enforce_safety, is_safe
+from guardrails.policy import PolicyEngine
+from guardrails.safety import detect_language, enforce_safety, evaluate_safety, is_safe
 
 
 def test_email_masking():
@@ -53,6 +54,68 @@ def test_enforce_safety():
     print(f"✓ Enforce safety: {msg[:50]}...")
 
 
+def test_policy_allowlist_and_regex():
+    assert is_safe("Which disease-resistant variety suits Punjab?")
+    assert not is_safe("Which diseases affect rice?")
+    assert not is_safe("Can I illegally sell seed?")
+    assert not is_safe("Is this berry poisonous?")
+    assert not is_safe("Which treatments work for rice?")
+    assert is_safe("How do I secure my grain store?")
+    assert not is_safe("which biopesticide works")
+    assert not is_safe("agrochemical spray for cotton")
+    verdict = evaluate_safety("Spray 5 ml per litre twice")
+    assert not verdict.allowed
+    assert verdict.categories == ("chemical",)
+    assert {match.rule_type for match in verdict.matches} == {"keyword", "regex"}
+    print(f"✓ Policy verdict: {verdict.categories}")
+
+
+def test_regional_and_language_policies():
+    assert is_safe("Can I burn stubble after harvest?", state="Tamil Nadu")
+    punjab = evaluate_safety("Can I burn stubble after harvest?", state="Punjab")
+    assert not punjab.allowed and punjab.policy == "punjab"
+    hindi = evaluate_safety("कीटनाशक की खुराक बताइए", language="hi")
+    assert not hindi.allowed and hindi.policy == "hindi"
+    assert hindi.message != enforce_safety("pesticide dose")[1]
+    assert not evaluate_safety("मुझे खुराक।", language="hi").allowed
+    tamil = evaluate_safety("பூச்சிக்கொல்லிகள் பற்றி சொல்", language="ta")
+    assert not tamil.allowed and tamil.policy == "tamil"
+    stacked = evaluate_safety("कीटनाशक की खुराक बताओ", state="Punjab", language="hi")
+    assert not stacked.allowed and stacked.policy == "hindi+punjab"
+    assert stacked.message == hindi.message
+    assert not evaluate_safety("Can I burn stubble after harvest?", state="Punjab", language="hi").allowed
+    assert detect_language("कीटनाशक की खुराक बताइए") == "hi"
+    assert detect_language("பூச்சிக்கொல்லி அளவு?") == "ta"
+    assert detect_language("pesticide dose") is None
+    print(f"✓ Regional policy: {punjab.policy}, language policy: {hindi.policy}")
+
+
+def test_regex_rules_prefiltered_by_literal():
+    regex = [
+        {"category": "illegal", "pattern": r"\bsell\s+\d+\s*kg\b"},
+        {"category": "chemical", "pattern": r"\d+\s*ml"},
+    ]
+    engine = PolicyEngine({"version": "1", "policies": [{"name": "default", "regex": regex}]})
+    policy = engine.compiled("default")
+    # Only the rule with a literal of 3+ characters ("sell") is bucketed; the other always runs.
+    assert sum(len(rules) for rules in policy.regex_buckets.values()) == 1
+    assert engine.evaluate("Can I SELL 40 kg at the mandi?").categories == ("illegal",)
+    assert engine.evaluate("Mix 5 ml and sell 2 kg").categories == ("chemical", "illegal")
+    assert engine.evaluate("Where can I sell my harvest?").allowed
+    print("✓ Regex rules prefiltered by required literal")
+
+
+def test_compiled_policy_cached_by_version():
+    document = {"version": "1", "policies": [{"name": "default", "categories": {"chemical": ["dose"]}}]}
+    engine = PolicyEngine(document)
+    first = engine.compiled("default")
+    engine.load(document)
+    assert engine.compiled("default") is first
+    engine.load({"version": "2", "policies": document["policies"]})
+    assert engine.compiled("default") is not first
+    print("✓ Compiled policies cached by version")
+
+
 if __name__ == "__main__":
     print("Running guardrails tests...\n")
     test_email_masking()
@@ -61,4 +124,8 @@ if __name__ == "__main__":
     test_redact_and_flag()
     test_safety_filter()
     test_enforce_safety()
+    test_policy_allowlist_and_regex()
+    test_regional_and_language_policies()
+    test_regex_rules_prefiltered_by_literal()
+    test_compiled_policy_cached_by_version()
     print("\n✅ All tests passed!")
@@ -0,0 +1,52 @@
+"""Unit tests for the pest knowledge base and pest agent."""
+
+from pathlib import Path
+
+from agents.pest_agent import explain_pest
+from tools.pest_knowledge import PestKnowledgeBase
+
+KB = PestKnowledgeBase.from_file(Path(__file__).parent / "data" / "pest_knowledge.json")
+
+
+def test_lookup_by_pest_name_and_misspelling():
+    assert KB.query("bollworm")[0].pest in {"Pink bollworm", "American bollworm"}
+    assert KB.query("whitfly")[0].pest == "Whitefly"
+    assert KB.query("planthoppers")[0].pest == "Brown planthopper"
+    print("✓ Pest name + fuzzy lookup")
+
+
+def test_lookup_by_symptom_crop_and_month():
+    assert {entry.pest for entry in KB.query("dead heart", crop="Rice")[:2]} == {"Yellow stem borer", "Pink stem borer"}
+    for entry in KB.query("", crop="Wheat", month="January"):
+        assert "Wheat" in entry.crops and "January" in entry.months
+    assert KB.query("") == ()
+    print("✓ Symptom/crop/month lookup")
+
+
+def test_query_is_cached():
+    before = KB.cache_info().hits
+    KB.query("sticky leaves", crop="Cotton")
+    KB.query("sticky leaves", crop="Cotton")
+    assert KB.cache_info().hits == before + 1
+    print("✓ Query cache hit")
+
+
+def test_explain_pest_uses_question_not_just_crop():
+    pest = explain_pest("Tell me about bollworm management", KB, crop="Rice")
+    assert "bollworm" in pest["topic"].lower()
+    crop_level = explain_pest("How to control pests in cotton safely?", KB, crop="Rice")
+    assert crop_level["topic"] == "Cotton"
+    assert explain_pest("rice")["explanation"].startswith("Watch for stem borer")
+    fallback = explain_pest("Any advice before sowing?", crop="Wheat")
+    assert fallback["topic"] == "Wheat"
+    assert fallback["explanation"].startswith("Scout for rust")
+    print(f"✓ Pest agent topic: {pest['topic']}")
+
+
+if __name__ == "__main__":
+    print("Running pest knowledge tests...\n")
+    test_lookup_by_pest_name_and_misspelling()
+    test_lookup_by_symptom_crop_and_month()
+    test_query_is_cached()
+    test_explain_pest_uses_question_not_just_crop()
+    print("\n✅ All tests passed!")
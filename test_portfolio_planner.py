@@ -0,0 +1,58 @@
+"""Unit tests for portfolio planning."""
+
+import json
+from pathlib import Path
+
+from agents.portfolio_planner import PortfolioPlanner
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def _load(name):
+    with (DATA_DIR / name).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _planner():
+    return PortfolioPlanner(_load("crop_calendar.json"), _load("weather_mock.json"), _load("readiness_defaults.json"))
+
+
+ROSTER = [
+    {"farm_id": "f1", "plots": [{"crop": "Rice", "state": "Tamil Nadu", "season": "Kharif", "area": 2.0}]},
+    {
+        "farm_id": "f2",
+        "plots": [
+            {"crop": "Rice", "state": "Tamil Nadu", "season": "Kharif", "area": 1.0},
+            {"crop": "Wheat", "state": "Punjab", "season": "Rabi", "area": 1.5},
+        ],
+    },
+]
+
+
+def test_identical_keys_share_one_plan():
+    planner = _planner()
+    results = list(planner.stream(ROSTER))
+    assert [r["farm_id"] for r in results] == ["f1", "f2"]
+    assert results[0]["plots"][0]["plan"] is results[1]["plots"][0]["plan"]
+    summary = planner.summary()
+    assert summary["unique_plans"] == 2 and summary["plots"] == 3 and summary["area"] == 4.5
+    print(f"✓ Portfolio streamed {summary['farms']} farms with {summary['unique_plans']} plans")
+
+
+def test_monthly_aggregates():
+    planner = _planner()
+    for _ in planner.stream(ROSTER):
+        pass
+    summary = planner.summary()
+    # Rice/Tamil Nadu is High labor (3x) over 3 ha in June.
+    assert summary["labor_by_month"]["June"] == 9.0
+    assert summary["irrigation_by_month"]["June"] == {"Canal/monsoon": 3.0}
+    assert list(summary["labor_by_month"])[0] == "January"
+    print("✓ Portfolio monthly aggregates")
+
+
+if __name__ == "__main__":
+    print("Running portfolio tests...\n")
+    test_identical_keys_share_one_plan()
+    test_monthly_aggregates()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,71 @@
+"""Unit tests for localized output rendering."""
+
+from agents.planner_agent import format_tasks
+from agents.risk_agent import summarize_risks
+from tools.renderer import Renderer, data_snapshot, render_risks, render_tasks, sms_segments
+
+TASKS = [
+    {"month": "June", "task": "Land prep", "when": "Early June", "why": "Monsoon", "how": "Puddle", "risk": "Medium", "risk_alert": "Watch onset"},
+    {"month": "July", "task": "Transplanting", "when": "July", "why": "Stable rain", "how": "20x15 cm", "risk": "High", "risk_alert": ""},
+]
+RISKS = {"May": {"level": "High", "alert": "Heat"}, "June": {"level": "Low", "alert": "Stable"}}
+
+
+def test_markdown_matches_agent_formatters():
+    lines = format_tasks(TASKS)
+    assert lines[0].startswith("**1.** **TASK:** Land prep | **WHEN:** Early June | **WHY:** Monsoon")
+    assert lines[0].endswith("🚨 **ALERT:** Watch onset")
+    assert "ALERT" not in lines[1]
+    assert summarize_risks(RISKS) == ["🔴 **May:** High | Heat", "🟢 **June:** Low | Stable"]
+    print("✓ Markdown rendering")
+
+
+def test_localized_sms_and_json():
+    hindi = render_tasks(TASKS, "hi", "markdown")
+    assert "**कार्य:**" in hindi[0] and "मध्यम" in hindi[0]
+    sms = render_tasks(TASKS * 20, "ta", "sms")
+    assert len(sms) == 3 and all(len(segment) <= 67 for segment in sms) and sms[-1].endswith("…")
+    assert render_risks(RISKS, "en", "sms") == ("May: High\nJune: Low",)
+    english = render_tasks(TASKS * 20, "en", "sms")
+    assert len(english) == 3 and all(len(segment) <= 153 for segment in english)
+    assert english[-1].endswith("...") and english[-1].isascii()
+    braces = sms_segments(["{rice} [kharif] | " * 30])
+    assert all(len(segment) + sum(segment.count(char) for char in "{}[]|") <= 153 for segment in braces)
+    assert all(len(segment) <= 67 for segment in sms_segments(["use `code` " * 30]))
+    assert '"level": "उच्च"' in render_risks(RISKS, "hi", "json")[0]
+    print(f"✓ Localized rendering: {sms[0]!r}")
+
+
+def test_cache_invalidated_by_snapshot():
+    renderer = Renderer(snapshot="v1")
+    key = ("Rice", "Tamil Nadu", "Kharif")
+    first = renderer.plan(key, TASKS, "hi", "sms")
+    assert renderer.plan(key, TASKS, "hi", "sms") is first
+    assert (renderer.hits, renderer.misses) == (1, 1)
+    renderer.set_snapshot("v2")
+    renderer.plan(key, TASKS, "hi", "sms")
+    assert renderer.misses == 2
+    updated = [dict(TASKS[0], risk="High"), TASKS[1]]
+    assert renderer.plan(key, updated, "hi", "sms") != first
+    assert renderer.misses == 3
+    print("✓ Render cache invalidated on snapshot change")
+
+
+def test_agent_formatters_share_renderer():
+    renderer = Renderer(snapshot=data_snapshot(TASKS, RISKS))
+    key = ("Rice", "Tamil Nadu", "Kharif")
+    assert format_tasks(TASKS, renderer=renderer, plan_key=key) == format_tasks(TASKS)
+    assert summarize_risks(RISKS, "hi", renderer=renderer, state="Tamil Nadu") == summarize_risks(RISKS, "hi")
+    format_tasks(TASKS, renderer=renderer, plan_key=key)
+    summarize_risks(RISKS, "hi", renderer=renderer, state="Tamil Nadu")
+    assert (renderer.hits, renderer.misses) == (2, 2)
+    print("✓ Agent formatters reuse the shared renderer")
+
+
+if __name__ == "__main__":
+    print("Running renderer tests...\n")
+    test_markdown_matches_agent_formatters()
+    test_localized_sms_and_json()
+    test_cache_invalidated_by_snapshot()
+    test_agent_formatters_share_renderer()
+    print("\n✅ All tests passed!")
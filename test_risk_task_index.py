@@ -0,0 +1,67 @@
+"""Unit tests for the precomputed risk-task join."""
+
+import json
+from datetime import date
+from pathlib import Path
+
+from agents.planner_agent import generate_plan
+from agents.risk_task_index import RiskTaskIndex, months_between
+
+DATA_DIR = Path(__file__).parent / "data"
+CALENDAR = json.loads((DATA_DIR / "crop_calendar.json").read_text(encoding="utf-8"))
+WEATHER = json.loads((DATA_DIR / "weather_mock.json").read_text(encoding="utf-8"))
+
+
+def test_index_matches_per_request_join():
+    index = RiskTaskIndex(CALENDAR, WEATHER)
+    direct = generate_plan(CALENDAR, "Rice", "Tamil Nadu", "Kharif", WEATHER["Tamil Nadu"])
+    indexed = generate_plan(CALENDAR, "Rice", "Tamil Nadu", "Kharif", {}, index=index)
+    assert direct == indexed
+    assert index.plan_tasks("Rice", "Kerala", "Kharif") is None
+    print("✓ Indexed plan matches direct join")
+
+
+def test_crop_overrides_apply_with_and_without_index():
+    weather = {"Tamil Nadu": {"June": {"level": "High", "alert": "Delayed monsoon", "crops": {"Rice": {"level": "Low"}}}}}
+    index = RiskTaskIndex(CALENDAR, weather)
+    direct = generate_plan(CALENDAR, "Rice", "Tamil Nadu", "Kharif", weather["Tamil Nadu"])
+    indexed = generate_plan(CALENDAR, "Rice", "Tamil Nadu", "Kharif", {}, index=index)
+    assert direct == indexed
+    assert direct["tasks"][0]["risk"] == "Low"
+    assert direct["tasks"][0]["risk_alert"] == "Delayed monsoon"
+    print("✓ Per-crop overrides consistent with and without index")
+
+
+def test_window_query_across_crops():
+    assert months_between(date(2026, 12, 20), 30) == ["December", "January"]
+    index = RiskTaskIndex(CALENDAR, WEATHER)
+    tasks = index.tasks_in_window("Tamil Nadu", date(2026, 9, 15), days=60)
+    assert {task["crop"] for task in tasks} == {"Rice", "Wheat"}
+    assert all(task["risk"] == "High" for task in tasks)
+    print(f"✓ Window query: {len(tasks)} high-risk tasks")
+
+
+def test_update_state_is_incremental():
+    index = RiskTaskIndex(CALENDAR, WEATHER)
+    punjab_before = index.plan_tasks("Wheat", "Punjab", "Rabi")
+    refreshed = index.update_state(
+        "Tamil Nadu",
+        {"June": {"level": "High", "alert": "Delayed monsoon", "crops": {"Cotton": {"level": "Low", "alert": ""}}}},
+    )
+    tamil_nadu_tasks = sum(
+        len(tasks) for states in CALENDAR.values() for tasks in states.get("Tamil Nadu", {}).values()
+    )
+    assert refreshed == tamil_nadu_tasks
+    june = index.plan_tasks("Rice", "Tamil Nadu", "Kharif")[0]
+    assert june["risk"] == "High" and june["risk_alert"] == "Delayed monsoon"
+    assert index.plan_tasks("Wheat", "Punjab", "Rabi") == punjab_before
+    print(f"✓ Incremental update refreshed {refreshed} tasks")
+
+
+if __name__ == "__main__":
+    print("Running risk-task index tests...\n")
+    test_index_matches_per_request_join()
+    test_crop_overrides_apply_with_and_without_index()
+    test_window_query_across_crops()
+    test_update_state_is_incremental()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,68 @@
+"""Unit tests for the semantic route cache."""
+
+from agents.supervisor_agent import SupervisorAgent
+from memory.route_cache import SemanticRouteCache
+
+PLANNER_ROUTE = {"intent": "season_planning", "agent": "planner_agent", "reason": "LLM inferred planning"}
+RISK_ROUTE = {"intent": "risk_check", "agent": "risk_agent", "reason": "LLM inferred risk check"}
+
+
+def test_paraphrase_hits_cache():
+    cache = SemanticRouteCache()
+    cache.store("plan rice kharif TN", PLANNER_ROUTE)
+    assert cache.lookup("kharif paddy schedule tamil nadu") == PLANNER_ROUTE
+    assert cache.lookup("What are weather risks for Maharashtra?") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    print(f"✓ Paraphrase cache hit: {stats}")
+
+
+def test_shared_context_does_not_collide_across_intents():
+    cache = SemanticRouteCache()
+    cache.store("show me the weather risk for kharif cotton in maharashtra this month", RISK_ROUTE)
+    cache.store("kharif cotton maharashtra please help me with the plan", PLANNER_ROUTE)
+    assert cache.lookup("show me the pest risk for kharif cotton in maharashtra this month") is None
+    assert cache.lookup("kharif cotton maharashtra please help me with the pests") is None
+    assert cache.lookup("irrigation risk for rabi wheat") is None
+    assert cache.lookup("are pests a weather risk for cotton") is None
+    cache.store("Show me the kharif rice calendar", PLANNER_ROUTE)
+    assert cache.lookup("pest calendar for cotton") is None
+    assert cache.lookup("pest schedule for kharif rice") is None
+    assert cache.lookup("kharif rice schedule") == PLANNER_ROUTE
+    assert cache.lookup("weather risks in punjab for rabi wheat") == RISK_ROUTE
+    print("✓ Cross-intent inputs miss the cache")
+
+
+def test_eviction_is_bounded():
+    cache = SemanticRouteCache(max_entries=2)
+    cache.store("plan kharif rice", PLANNER_ROUTE)
+    cache.store("weather risk punjab", {"intent": "risk_check", "agent": "risk_agent", "reason": "r"})
+    cache.store("cotton bollworm pest", {"intent": "pest_guidance", "agent": "pest_agent", "reason": "p"})
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+    assert cache.lookup("plan kharif rice") is None
+    print("✓ Route cache eviction bounded")
+
+
+def test_supervisor_skips_llm_on_hit():
+    cache = SemanticRouteCache()
+    cache.store("Plan Kharif rice in Tamil Nadu", PLANNER_ROUTE)
+    supervisor = SupervisorAgent(cache=cache)
+
+    def fail_chat(prompt):
+        raise AssertionError("LLM should not be called on a cache hit")
+
+    supervisor._ollama_chat = fail_chat
+    route = supervisor.route("plan kharif rice tamil nadu", {"crop": "Rice"})
+    assert route == PLANNER_ROUTE
+    print("✓ Supervisor reused cached route")
+
+
+if __name__ == "__main__":
+    print("Running route cache tests...\n")
+    test_paraphrase_hits_cache()
+    test_shared_context_does_not_collide_across_intents()
+    test_eviction_is_bounded()
+    test_supervisor_skips_llm_on_hit()
+    print("\n✅ All tests passed!")
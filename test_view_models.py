@@ -0,0 +1,43 @@
+"""Unit tests for the UI view models."""
+
+import json
+from pathlib import Path
+
+from ui.view_models import build_plan_view, build_risk_view, risk_tier
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def _load(name):
+    with (DATA_DIR / name).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_plan_view_precomputes_cards():
+    view = build_plan_view(
+        _load("crop_calendar.json"), _load("weather_mock.json"), _load("readiness_defaults.json"),
+        "Rice", "Tamil Nadu", "Kharif",
+    )
+    assert len(view.tasks) == 6
+    assert view.tasks[0].month == "June"
+    assert view.tasks[4].risk_tier == "high"
+    assert dict(view.readiness)["Labor intensity"] == "High"
+    assert isinstance(dict(view.readiness)["Weather flags"], tuple)
+    hash(view)  # frozen, so safe to share from st.cache_data
+    print(f"✓ Plan view: {len(view.tasks)} cards")
+
+
+def test_risk_view_tiers():
+    view = build_risk_view(_load("weather_mock.json"), "Maharashtra")
+    tiers = {tier for tier, _ in view.lines}
+    assert tiers == {"high", "medium", "low"}
+    assert risk_tier("Heat stress in dry spells") == "high"
+    assert risk_tier("Low") == "low"
+    print("✓ Risk view tiers")
+
+
+if __name__ == "__main__":
+    print("Running view model tests...\n")
+    test_plan_view_precomputes_cards()
+    test_risk_view_tiers()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import difflib
+import json
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z]+")
+
+STOPWORDS = {
+    "a", "about", "and", "are", "can", "control", "do", "for", "field", "from", "handle", "how", "i",
+    "in", "is", "manage", "me", "my", "of", "on", "pest", "pests", "plants", "safe", "safely", "tell",
+    "the", "to", "what", "whats", "with",
+}
+
+MONTHS = {
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+}
+
+CROP_ALIASES = {"paddy": "rice"}
+
+NAME_WEIGHT = 3.0
+SYMPTOM_WEIGHT = 1.0
+CONTEXT_WEIGHT = 0.5
+FUZZY_CANDIDATES = 32
+FUZZY_GRAMS = 6
+
+
+@dataclass(frozen=True)
+class PestEntry:
+    pest: str
+    aliases: Tuple[str, ...]
+    crops: Tuple[str, ...]
+    states: Tuple[str, ...]
+    months: Tuple[str, ...]
+    symptoms: Tuple[str, ...]
+    note: str
+
+
+def load_pest_knowledge(path: Path) -> List[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _words(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+def _trigrams(word: str) -> Set[str]:
+    padded = f"^{word}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class PestKnowledgeBase:
+    """Inverted-index lookup over pest records by name, crop, state, month and symptom.
+
+    Query tokens that are not in the vocabulary are folded to their singular form or
+    matched fuzzily so that "bolworm" or "whiteflies" still resolve. Results of
+    ``query`` are memoised in an LRU cache of ``cache_size`` entries.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]], cache_size: int = 4096) -> None:
+        self.entries: List[PestEntry] = []
+        self._names: Dict[str, Set[int]] = defaultdict(set)
+        self._symptoms: Dict[str, Set[int]] = defaultdict(set)
+        self._crops: Dict[str, Set[int]] = defaultdict(set)
+        self._states: Dict[str, Set[int]] = defaultdict(set)
+        self._months: Dict[str, Set[int]] = defaultdict(set)
+        for record in records:
+            self._add(record)
+        self._trigram_index: Dict[str, List[str]] = defaultdict(list)
+        for word in sorted(set(self._names) | set(self._symptoms)):
+            for gram in _trigrams(word):
+                self._trigram_index[gram].append(word)
+        self._cached_query = lru_cache(maxsize=cache_size)(self._query)
+        self._resolve_token = lru_cache(maxsize=cache_size)(self._resolve)
+
+    @classmethod
+    def from_file(cls, path: Path, cache_size: int = 4096) -> "PestKnowledgeBase":
+        return cls(load_pest_knowledge(path), cache_size=cache_size)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _add(self, record: Dict[str, Any]) -> None:
+        entry = PestEntry(
+            pest=record["pest"],
+            aliases=tuple(record.get("aliases", [])),
+            crops=tuple(record.get("crops", [])),
+            states=tuple(record.get("states", [])),
+            months=tuple(record.get("months", [])),
+            symptoms=tuple(record.get("symptoms", [])),
+            note=record.get("note", ""),
+        )
+        entry_id = len(self.entries)
+        self.entries.append(entry)
+        for phrase in (entry.pest,) + entry.aliases:
+            for word in _words(phrase):
+                self._names[word].add(entry_id)
+        for phrase in entry.symptoms:
+            for word in _words(phrase):
+                if word not in STOPWORDS:
+                    self._symptoms[word].add(entry_id)
+        for crop in entry.crops:
+            self._crops[crop.lower()].add(entry_id)
+        for state in entry.states:
+            self._states[state.lower()].add(entry_id)
+        for month in entry.months:
+            self._months[month.lower()].add(entry_id)
+
+    def _resolve(self, word: str) -> Optional[str]:
+        """Map a query word onto the index vocabulary, tolerating plurals and typos."""
+        if word in self._names or word in self._symptoms:
+            return word
+        for suffix in ("ies", "es", "s"):
+            if word.endswith(suffix):
+                stem = word[: -len(suffix)] + ("y" if suffix == "ies" else "")
+                if stem in self._names or stem in self._symptoms:
+                    return stem
+        if len(word) < 4:
+            return None
+        # Only words sharing the query's rarer trigrams can clear the similarity cutoff,
+        # so difflib runs over a short candidate list instead of the whole vocabulary.
+        postings = sorted((self._trigram_index.get(gram, []) for gram in _trigrams(word)), key=len)
+        shared: Counter = Counter()
+        for words in postings[:FUZZY_GRAMS]:
+            shared.update(words)
+        candidates = [candidate for candidate, _ in shared.most_common(FUZZY_CANDIDATES)]
+        close = difflib.get_close_matches(word, candidates, n=1, cutoff=0.8)
+        return close[0] if close else None
+
+    def query(
+        self,
+        text: str = "",
+        crop: Optional[str] = None,
+        state: Optional[str] = None,
+        month: Optional[str] = None,
+        limit: int = 5,
+    ) -> Tuple[PestEntry, ...]:
+        """Return up to ``limit`` entries ranked by relevance to the text and context.
+
+        Pest names and symptom words in ``text`` select candidates; crop, state and
+        month only boost the ranking. Crops and months mentioned in the text override
+        the arguments. With no name or symptom match, entries matching all given
+        context filters are returned.
+        """
+        words = tuple(word for word in _words(text) if word not in STOPWORDS)
+        return self._cached_query(
+            words,
+            (crop or "").lower(),
+            (state or "").lower(),
+            (month or "").lower(),
+            limit,
+        )
+
+    def matched_terms(self, text: str) -> Tuple[str, ...]:
+        """Return the pest-name and symptom words recognised in ``text``."""
+        words = (CROP_ALIASES.get(word, word) for word in _words(text) if word not in STOPWORDS)
+        resolved = (self._resolve_token(word) for word in words if word not in self._crops and word not in MONTHS)
+        return tuple(word for word in resolved if word)
+
+    def cache_info(self):
+        return self._cached_query.cache_info()
+
+    def _query(self, words: Tuple[str, ...], crop: str, state: str, month: str, limit: int) -> Tuple[PestEntry, ...]:
+        scores: Dict[int, float] = defaultdict(float)
+        for word in words:
+            word = CROP_ALIASES.get(word, word)
+            if word in self._crops:
+                # A crop named in the question beats the crop selected in the UI.
+                crop = word
+                continue
+            if word in MONTHS:
+                month = word
+                continue
+            resolved = self._resolve_token(word)
+            if resolved is None:
+                continue
+            for entry_id in self._names.get(resolved, ()):
+                scores[entry_id] += NAME_WEIGHT
+            for entry_id in self._symptoms.get(resolved, ()):
+                scores[entry_id] += SYMPTOM_WEIGHT
+
+        context = [
+            index.get(key, set()) for index, key in ((self._crops, crop), (self._states, state), (self._months, month)) if key
+        ]
+        if not scores:
+            if not context:
+                return ()
+            candidates = set.intersection(*context)
+            scores = {entry_id: 0.0 for entry_id in candidates}
+
+        for ids in context:
+            for entry_id in scores:
+                if entry_id in ids:
+                    scores[entry_id] += CONTEXT_WEIGHT
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return tuple(self.entries[entry_id] for entry_id, _ in ranked[:limit])
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from string import Template
+from typing import Any, Dict, Hashable, List, Tuple
+
+CHANNELS = ("markdown", "sms", "json")
+
+LOCALES: Dict[str, Dict[str, Any]] = {
+    "en": {
+        "labels": {"task": "TASK", "when": "WHEN", "why": "WHY", "how": "HOW", "risk": "RISK", "alert": "ALERT"},
+        "levels": {"Low": "Low", "Medium": "Medium", "High": "High"},
+    },
+    "hi": {
+        "labels": {"task": "कार्य", "when": "कब", "why": "क्यों", "how": "कैसे", "risk": "जोखिम", "alert": "चेतावनी"},
+        "levels": {"Low": "कम", "Medium": "मध्यम", "High": "उच्च"},
+    },
+    "ta": {
+        "labels": {"task": "பணி", "when": "எப்போது", "why": "ஏன்", "how": "எப்படி", "risk": "அபாயம்", "alert": "எச்சரிக்கை"},
+        "levels": {"Low": "குறைவு", "Medium": "நடுத்தரம்", "High": "அதிகம்"},
+    },
+}
+
+TEMPLATES = {
+    "markdown": {
+        "task": "**$index.** **$l_task:** $task | **$l_when:** $when | **$l_why:** $why | **$l_how:** $how | **$l_risk:** $risk",
+        "task_alert": " | 🚨 **$l_alert:** $alert",
+        "risk": "$emoji **$month:** $level | $alert",
+    },
+    "sms": {
+        "task": "$index. $month: $task ($l_risk: $risk)",
+        "task_alert": "",
+        "risk": "$month: $level",
+    },
+}
+
+RISK_EMOJI = {"Low": "🟢", "Medium": "🟡"}
+
+# SMS units per message: GSM-7 septets when every character is in the GSM 03.38
+# alphabet, UCS-2 code units otherwise. A message split into parts loses room in each
+# part to the concatenation header.
+SMS_LIMITS = {"gsm": 160, "ucs2": 70}
+SMS_PART_LIMITS = {"gsm": 153, "ucs2": 67}
+SMS_ELLIPSIS = {"gsm": "...", "ucs2": "…"}
+GSM_BASIC = frozenset(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+# Extension-table characters are sent as an escape plus a septet, so they count twice.
+GSM_EXTENSION = frozenset("^{}\\[~]|€\f")
+
+
+def data_snapshot(*documents: Any) -> str:
+    """Stable fingerprint of the data an output was rendered from."""
+    digest = hashlib.sha1()
+    for document in documents:
+        digest.update(json.dumps(document, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def compiled_templates(locale: str, channel: str) -> Dict[str, Template]:
+    """Templates for one (locale, channel) with the locale's labels already substituted."""
+    labels = {f"l_{key}": value for key, value in LOCALES[locale]["labels"].items()}
+    return {name: Template(Template(text).safe_substitute(labels)) for name, text in TEMPLATES[channel].items()}
+
+
+def _level(locale: str, level: str) -> str:
+    return LOCALES[locale]["levels"].get(level, level)
+
+
+def render_tasks(tasks: List[Dict[str, Any]], locale: str = "en", channel: str = "markdown") -> Tuple[str, ...]:
+    """Render planner tasks; markdown gives one line per task, sms gives message segments."""
+    if channel == "json":
+        return (json.dumps([dict(task, risk=_level(locale, task.get("risk", ""))) for task in tasks], ensure_ascii=False),)
+    templates = compiled_templates(locale, channel)
+    lines = []
+    for idx, task in enumerate(tasks, 1):
+        fields = {key: task.get(key, "") for key in ("month", "task", "when", "why", "how", "risk_alert")}
+        line = templates["task"].safe_substitute(fields, index=idx, risk=_level(locale, task.get("risk", "")))
+        if task.get("risk_alert"):
+            line += templates["task_alert"].safe_substitute(alert=task["risk_alert"])
+        lines.append(line)
+    return tuple(lines) if channel == "markdown" else sms_segments(lines)
+
+
+def render_risks(risk_map: Dict[str, Dict[str, Any]], locale: str = "en", channel: str = "markdown") -> Tuple[str, ...]:
+    """Render a month -> {level, alert} risk map; markdown gives one line per month."""
+    if channel == "json":
+        return (
+            json.dumps(
+                {month: dict(info, level=_level(locale, info.get("level", "Medium"))) for month, info in risk_map.items()},
+                ensure_ascii=False,
+            ),
+        )
+    template = compiled_templates(locale, channel)["risk"]
+    lines = []
+    for month, info in risk_map.items():
+        level = info.get("level", "Medium")
+        lines.append(
+            template.safe_substitute(
+                emoji=RISK_EMOJI.get(level, "🔴"), month=month, level=_level(locale, level), alert=info.get("alert", "")
+            )
+        )
+    return tuple(lines) if channel == "markdown" else sms_segments(lines)
+
+
+def _sms_length(text: str, encoding: str) -> int:
+    if encoding == "gsm":
+        return len(text) + sum(1 for char in text if char in GSM_EXTENSION)
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _sms_prefix(text: str, limit: int, encoding: str) -> str:
+    """Longest prefix of text that fits in ``limit`` units."""
+    used = 0
+    for end, char in enumerate(text):
+        used += _sms_length(char, encoding)
+        if used > limit:
+            return text[:end]
+    return text
+
+
+def _pack(lines: List[str], limit: int, encoding: str) -> List[str]:
+    segments: List[str] = []
+    current = ""
+    for line in lines:
+        while line:
+            room = limit - _sms_length(current, encoding) - (1 if current else 0)
+            if _sms_length(line, encoding) <= room:
+                current = f"{current}\n{line}" if current else line
+                line = ""
+            elif current:
+                segments.append(current)
+                current = ""
+            else:
+                head = _sms_prefix(line, limit, encoding)
+                segments.append(head)
+                line = line[len(head) :]
+    if current:
+        segments.append(current)
+    return segments
+
+
+def sms_segments(lines: List[str], max_segments: int = 3) -> Tuple[str, ...]:
+    """Pack lines into SMS parts, truncating with an ellipsis past ``max_segments``.
+
+    Text that fits one message uses the full single-message limit; longer text is
+    packed into concatenated parts of 153 septets (GSM-7) or 67 code units (UCS-2).
+    """
+    text = "\n".join(lines)
+    encoding = "gsm" if all(char in GSM_BASIC or char in GSM_EXTENSION for char in text) else "ucs2"
+    segments = _pack(lines, SMS_LIMITS[encoding], encoding)
+    if len(segments) > 1:
+        segments = _pack(lines, SMS_PART_LIMITS[encoding], encoding)
+    if len(segments) > max_segments:
+        ellipsis = SMS_ELLIPSIS[encoding]
+        room = SMS_PART_LIMITS[encoding] - _sms_length(ellipsis, encoding)
+        segments = segments[:max_segments]
+        segments[-1] = _sms_prefix(segments[-1], room, encoding) + ellipsis
+    return tuple(segments)
+
+
+class Renderer:
+    """LRU cache of rendered outputs keyed by (snapshot, kind, key, content, locale, channel).
+
+    The content fingerprint covers the tasks or risk map actually passed in, so data
+    changed without a new snapshot (e.g. ``RiskTaskIndex.update_state``) is re-rendered.
+    ``set_snapshot`` with a different data fingerprint discards everything rendered
+    from the old data, and renders that were in flight during the switch are not stored.
+    """
+
+    def __init__(self, snapshot: str = "", max_entries: int = 2048) -> None:
+        self.snapshot = snapshot
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[Hashable, ...], Tuple[str, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def set_snapshot(self, snapshot: str) -> None:
+        with self._lock:
+            if snapshot != self.snapshot:
+                self.snapshot = snapshot
+                self._cache.clear()
+
+    def _cached(self, key: Tuple[Hashable, ...], render) -> Tuple[str, ...]:
+        if key[-1] not in CHANNELS or key[-2] not in LOCALES:
+            raise ValueError(f"Unsupported locale/channel: {key[-2]}/{key[-1]}")
+        with self._lock:
+            key = (self.snapshot,) + key
+            output = self._cache.get(key)
+            if output is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return output
+            self.misses += 1
+        output = render()
+        with self._lock:
+            if key[0] != self.snapshot:
+                return output
+            self._cache[key] = output
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return output
+
+    def plan(
+        self, plan_key: Tuple[str, str, str], tasks: List[Dict[str, Any]], locale: str = "en", channel: str = "markdown"
+    ) -> Tuple[str, ...]:
+        key = ("plan", plan_key, data_snapshot(tasks), locale, channel)
+        return self._cached(key, lambda: render_tasks(tasks, locale, channel))
+
+    def risks(
+        self, state: str, risk_map: Dict[str, Dict[str, Any]], locale: str = "en", channel: str = "markdown"
+    ) -> Tuple[str, ...]:
+        key = ("risk", state, data_snapshot(risk_map), locale, channel)
+        return self._cached(key, lambda: render_risks(risk_map, locale, channel))
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import atexit
 import json
+import os
 import sys
+import time
+from datetime import date
 from pathlib import Path
 from typing import Any, Dict
 
@@ -9,33 +13,23 @@ import streamlit as st
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from agents.planner_agent import build_readiness, format_tasks, generate_plan
-from agents.pest_agent import explain_pest
-from agents.risk_agent import full_risk_map, summarize_risks
+from agents.risk_task_index import RiskTaskIndex
 from agents.supervisor_agent import SupervisorAgent
 from guardrails.pii import redact_and_flag
-from guardrails.safety import enforce_safety
+from guardrails.safety import detect_language, evaluate_safety
+from memory.audit_log import AuditSink
+from memory.route_cache import SemanticRouteCache
 from memory.session_store import SessionStore
 from tools.crop_calendar_loader import load_calendar
+from tools.pest_knowledge import PestKnowledgeBase
+from tools.renderer import Renderer, data_snapshot
 from tools.weather_api import load_weather
+from ui.view_models import PestView, PlanView, RiskView, build_pest_view, build_plan_view, build_risk_view
 
 DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+AUDIT_DIR = Path(os.environ.get("AUDIT_LOG_DIR", Path(__file__).resolve().parents[1] / "audit_logs"))
 
-
-@st.cache_data(show_spinner=False)
-def load_static_data() -> Dict[str, Any]:
-    calendar = load_calendar(DATA_DIR / "crop_calendar.json")
-    weather = load_weather(DATA_DIR / "weather_mock.json")
-    with (DATA_DIR / "readiness_defaults.json").open("r", encoding="utf-8") as f:
-        readiness = json.load(f)
-    return {"calendar": calendar, "weather": weather, "readiness": readiness}
-
-
-def main() -> None:
-    st.set_page_config(page_title="Agentic Farm Demo", layout="wide", page_icon="🌾")
-    
-    # Custom color scheme
-    st.markdown("""
+CUSTOM_CSS = """
         <style>
             .main {
                 padding-top: 2rem;
@@ -69,7 +63,305 @@ def main() -> None:
                 box-shadow: 0 2px 4px rgba(0,0,0,0.1);
             }
         </style>
-    """, unsafe_allow_html=True)
+"""
+
+TIER_STYLES = {
+    "high": ("warning", "⚠️", "🔴"),
+    "medium": ("info", "ℹ️", "🟡"),
+    "low": ("success", "✓", "🟢"),
+}
+LINE_STYLES = {"high": "error", "medium": "warning", "low": "success"}
+
+
+@st.cache_data(show_spinner=False)
+def load_static_data() -> Dict[str, Any]:
+    calendar = load_calendar(DATA_DIR / "crop_calendar.json")
+    weather = load_weather(DATA_DIR / "weather_mock.json")
+    with (DATA_DIR / "readiness_defaults.json").open("r", encoding="utf-8") as f:
+        readiness = json.load(f)
+    return {
+        "calendar": calendar,
+        "weather": weather,
+        "readiness": readiness,
+        "snapshot": data_snapshot(calendar, weather),
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def get_route_cache() -> SemanticRouteCache:
+    return SemanticRouteCache(max_entries=512)
+
+
+@st.cache_resource(show_spinner=False)
+def get_audit_sink() -> AuditSink:
+    sink = AuditSink(AUDIT_DIR)
+    atexit.register(sink.close)
+    return sink
+
+
+@st.cache_resource(show_spinner=False)
+def get_supervisor() -> SupervisorAgent:
+    return SupervisorAgent(
+        model="phi3:mini", endpoint="http://localhost:11434/api/chat", mock=False, cache=get_route_cache()
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_pest_knowledge() -> PestKnowledgeBase:
+    return PestKnowledgeBase.from_file(DATA_DIR / "pest_knowledge.json")
+
+
+@st.cache_resource(show_spinner=False)
+def get_risk_index() -> RiskTaskIndex:
+    data = load_static_data()
+    return RiskTaskIndex(data["calendar"], data["weather"])
+
+
+@st.cache_resource(show_spinner=False)
+def get_renderer() -> Renderer:
+    return Renderer()
+
+
+def shared_renderer() -> Renderer:
+    """The process-wide renderer, switched to the snapshot of the currently loaded data."""
+    renderer = get_renderer()
+    renderer.set_snapshot(load_static_data()["snapshot"])
+    return renderer
+
+
+@st.cache_data(show_spinner=False)
+def plan_view(crop: str, state: str, season: str) -> PlanView:
+    data = load_static_data()
+    return build_plan_view(
+        data["calendar"], data["weather"], data["readiness"], crop, state, season, index=get_risk_index()
+    )
+
+
+@st.cache_data(show_spinner=False)
+def risk_view(state: str, today: date) -> RiskView:
+    return build_risk_view(
+        load_static_data()["weather"], state, index=get_risk_index(), today=today, renderer=shared_renderer()
+    )
+
+
+def pest_view(question: str, crop: str) -> PestView:
+    # Not st.cache_data: questions are free-form text, and PestKnowledgeBase.query keeps its own bounded LRU.
+    return build_pest_view(question, get_pest_knowledge(), crop=crop)
+
+
+def render_plan(view: PlanView) -> None:
+    st.success("✅ Planner Agent Output")
+
+    # Header with context
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("🌱 Crop", view.crop)
+    with col2:
+        st.metric("📍 Location", view.state)
+    with col3:
+        st.metric("📆 Season", view.season)
+    with col4:
+        st.metric("📋 Tasks", len(view.tasks))
+
+    st.divider()
+
+    if view.tasks:
+        st.markdown("### 📅 Month-wise Task Plan")
+        st.caption("Format: **TASK → WHEN → WHY → HOW → RISK**")
+
+        for card in view.tasks:
+            # Month badge at the top
+            st.markdown(f"<div class='task-month'>📅 **{card.month}**</div>", unsafe_allow_html=True)
+
+            with st.container(border=True):
+                st.markdown(f"#### ✅ {card.task}")
+
+                info_col1, info_col2 = st.columns([1, 1])
+                with info_col1:
+                    st.markdown(f"**⏰ When:** {card.when}")
+                    st.markdown(f"**💡 Why:** {card.why}")
+                with info_col2:
+                    st.markdown(f"**🔧 How:** {card.how}")
+
+                # Risk assessment
+                st.divider()
+                method, icon, badge = TIER_STYLES[card.risk_tier]
+                getattr(st, method)(f"{icon} **Risk Level:** {badge} **{card.risk}**")
+
+                # Critical alerts
+                if card.risk_alert:
+                    st.error(f"🚨 **Critical Alert:** {card.risk_alert}")
+
+            st.write("")  # Spacing between tasks
+    else:
+        st.warning(view.note)
+
+    st.divider()
+
+    # Readiness checklist in columns
+    st.markdown("### 📦 Input Readiness Checklist")
+    st.caption("Non-monetary requirements for this season")
+
+    checklist_cols = st.columns(2)
+    for idx, (key, value) in enumerate(view.readiness):
+        with checklist_cols[idx % 2]:
+            with st.container(border=True):
+                st.markdown(f"**{key}**")
+                if isinstance(value, tuple):
+                    for item in value:
+                        st.markdown(f"  • {item}")
+                else:
+                    st.markdown(f"`{value}`")
+
+
+def render_risk(view: RiskView) -> None:
+    st.warning("⚠️ Risk Agent Output")
+    st.markdown(f"### 🌦️ Weather Risk Assessment: {view.state}")
+    st.caption("Monthly risk levels and alerts")
+
+    risk_cols = st.columns(2)
+    for idx, (tier, line) in enumerate(view.lines):
+        with risk_cols[idx % 2]:
+            getattr(st, LINE_STYLES[tier])(line)
+
+    if view.upcoming:
+        st.markdown("#### ⏳ High-risk tasks in the next 60 days")
+        for line in view.upcoming:
+            st.markdown(f"- {line}")
+
+
+def render_pest(view: PestView) -> None:
+    st.info("🐛 Pest / RNAi Agent Output")
+    st.markdown(f"### {view.title}")
+
+    with st.container(border=True):
+        st.markdown("**🔬 Monitoring & Approach**")
+        st.markdown(view.explanation)
+
+    st.divider()
+
+    with st.container(border=True):
+        st.markdown("**🧬 Why RNAi Technology?**")
+        st.markdown(view.why_rnai)
+
+    st.divider()
+
+    with st.container(border=True):
+        st.markdown("**🛡️ Safety & Best Practices**")
+        st.markdown(view.safety)
+
+
+@st.fragment
+def render_logs() -> None:
+    """Logs panel; reruns on its own when only the logs change (e.g. Clear Logs)."""
+    st.subheader("🔍 Agent Reasoning / Logs")
+    st.caption("Transparency: See supervisor routing & guardrail actions")
+
+    if not st.session_state["logs"]:
+        st.info("No logs yet. Run an agent to see reasoning.")
+
+    for log in reversed(st.session_state["logs"][-5:]):  # Show last 5
+        if log.get("event") == "supervisor":
+            route = log.get("route", {})
+            st.code(
+                f"🧠 Supervisor Detected:\n"
+                f"Intent: {route.get('intent')}\n"
+                f"Agent: {route.get('agent')}\n"
+                f"Reason: {route.get('reason')}\n"
+                f"PII Masked: {log.get('pii_masked')}\n"
+                f"Note: Repeated intents may reuse cached routing from session memory."
+            )
+        elif log.get("event") == "safety_block":
+            st.code(
+                f"🛡️ Blocked: {log.get('message')}\n"
+                f"Policy: {log.get('policy')}\n"
+                f"Categories: {log.get('categories')}"
+            )
+
+    cache_stats = get_route_cache().stats()
+    st.caption(
+        f"Route cache: {cache_stats['entries']} entries | hit rate {cache_stats['hit_rate']:.0%} | "
+        f"avg lookup {cache_stats['avg_lookup_ms']:.2f} ms"
+    )
+    audit_stats = get_audit_sink().stats()
+    st.caption(f"Audit log: {audit_stats['written']} written | {audit_stats['dropped']} dropped")
+    if "rerun_cpu_ms" in st.session_state:
+        st.caption(f"Last full rerun: {st.session_state['rerun_cpu_ms']:.1f} ms CPU")
+
+    # Add clear logs button
+    if st.button("🗑️ Clear Logs"):
+        st.session_state["logs"] = []
+        st.rerun(scope="fragment")
+
+
+@st.fragment
+def render_request() -> None:
+    """Request inputs and Run button.
+
+    A fragment, so typing or changing a selection reruns only these widgets; the
+    result below is re-rendered only by a full rerun after a run.
+    """
+    st.subheader("🎯 User Request")
+    
+    # Demo prompt buttons
+    st.markdown("**Quick demos:**")
+    demo_cols = st.columns(3)
+    with demo_cols[0]:
+        if st.button("📅 Planner", use_container_width=True):
+            st.session_state["demo_input"] = "Plan Kharif rice in Tamil Nadu"
+    with demo_cols[1]:
+        if st.button("🌦️ Risk", use_container_width=True):
+            st.session_state["demo_input"] = "What are weather risks for Maharashtra?"
+    with demo_cols[2]:
+        if st.button("🐛 Pest/RNAi", use_container_width=True):
+            st.session_state["demo_input"] = "How to control pests in cotton safely?"
+    
+    user_input = st.text_area(
+        "Describe your farming need:",
+        value=st.session_state.get("demo_input", ""),
+        height=100,
+        placeholder="e.g., Plan Kharif rice in Tamil Nadu, What are weather risks?, How to handle pests?"
+    )
+    
+    col_crop, col_state, col_season = st.columns(3)
+    with col_crop:
+        crop = st.selectbox("🌱 Crop", ["Rice", "Wheat", "Cotton"], index=0)
+    with col_state:
+        state = st.selectbox("📍 Location", ["Tamil Nadu", "Punjab", "Maharashtra"], index=0)
+    with col_season:
+        season = st.selectbox("📆 Season", ["Kharif", "Rabi"], index=0)
+
+    result = st.session_state.get("result")
+    if result is not None and result["inputs"] != (crop, state, season):
+        st.info(f"ℹ️ Results below are for {' · '.join(result['inputs'])}. Run the agent again to update them.")
+
+    if st.button("🚀 Run Agent", type="primary", use_container_width=True):
+        run_agent(user_input, crop, state, season)
+        st.rerun()
+
+
+def render_result() -> None:
+    """Agent output of the last run."""
+    result = st.session_state.get("result")
+    if result is None:
+        return
+    agent, view = result["agent"], result["view"]
+    if agent == "planner_agent":
+        render_plan(view)
+    elif agent == "risk_agent":
+        render_risk(view)
+    elif agent == "pest_agent":
+        render_pest(view)
+    else:
+        st.write("❌ No agent selected.")
+
+
+def main() -> None:
+    rerun_start = time.process_time()
+    st.set_page_config(page_title="Agentic Farm Demo", layout="wide", page_icon="🌾")
+    
+    # Custom color scheme (constant; Streamlit drops elements that are not re-emitted)
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
     
     st.markdown("# 🌾 Seasonal Farm Planner & Risk Alert")
     st.markdown("### Phase-1 Agentic AI Demo")
@@ -95,223 +387,80 @@ def main() -> None:
     if "logs" not in st.session_state:
         st.session_state["logs"] = []
 
-    data = load_static_data()
-    calendar = data["calendar"]
-    weather = data["weather"]
-    readiness_defaults = data["readiness"]
-
     col_input, col_logs = st.columns([2, 1])
 
     with col_input:
-        st.subheader("🎯 User Request")
-        
-        # Demo prompt buttons
-        st.markdown("**Quick demos:**")
-        demo_cols = st.columns(3)
-        with demo_cols[0]:
-            if st.button("📅 Planner", use_container_width=True):
-                st.session_state["demo_input"] = "Plan Kharif rice in Tamil Nadu"
-        with demo_cols[1]:
-            if st.button("🌦️ Risk", use_container_width=True):
-                st.session_state["demo_input"] = "What are weather risks for Maharashtra?"
-        with demo_cols[2]:
-            if st.button("🐛 Pest/RNAi", use_container_width=True):
-                st.session_state["demo_input"] = "How to control pests in cotton safely?"
-        
-        user_input = st.text_area(
-            "Describe your farming need:",
-            value=st.session_state.get("demo_input", ""),
-            height=100,
-            placeholder="e.g., Plan Kharif rice in Tamil Nadu, What are weather risks?, How to handle pests?"
+        render_request()
+        for method, message in st.session_state.get("notices", []):
+            getattr(st, method)(message)
+        render_result()
+
+    st.session_state["rerun_cpu_ms"] = 1000 * (time.process_time() - rerun_start)
+    with col_logs:
+        render_logs()
+
+
+def run_agent(user_input: str, crop: str, state: str, season: str) -> None:
+    """Apply guardrails, route the request and store the resulting view model and notices."""
+    st.session_state["result"] = None
+    notices = st.session_state["notices"] = []
+    if not user_input.strip():
+        notices.append(("warning", "⚠️ Please enter a request first."))
+        return
+
+    started = time.perf_counter()
+    masked_text, pii_flag = redact_and_flag(user_input)
+    language = detect_language(user_input)
+    verdict = evaluate_safety(user_input, state=state, language=language)
+    guardrail_ms = 1000 * (time.perf_counter() - started)
+    audit = {
+        "input": masked_text,
+        "pii_masked": pii_flag,
+        "context": {"crop": crop, "state": state, "season": season, "language": language},
+        "verdict": {
+            "allowed": verdict.allowed,
+            "policy": verdict.policy,
+            "version": verdict.version,
+            "categories": list(verdict.categories),
+        },
+        "latency_ms": {"guardrails": round(guardrail_ms, 3)},
+    }
+
+    if pii_flag:
+        notices.append(("info", "🔒 PII detected and masked in your input."))
+
+    if not verdict.allowed:
+        notices.append(("error", f"🛡️ Safety Filter Blocked: {verdict.message}"))
+        st.session_state["logs"].append(
+            {
+                "event": "safety_block",
+                "message": verdict.message,
+                "policy": f"{verdict.policy} v{verdict.version}",
+                "categories": ", ".join(verdict.categories),
+            }
         )
-        
-        col_crop, col_state, col_season = st.columns(3)
-        with col_crop:
-            crop = st.selectbox("🌱 Crop", ["Rice", "Wheat", "Cotton"], index=0)
-        with col_state:
-            state = st.selectbox("📍 Location", ["Tamil Nadu", "Punjab", "Maharashtra"], index=0)
-        with col_season:
-            season = st.selectbox("📆 Season", ["Kharif", "Rabi"], index=0)
-
-        supervisor = SupervisorAgent(model="phi3:mini", endpoint="http://localhost:11434/api/chat", mock=False)
-
-        if st.button("🚀 Run Agent", type="primary", use_container_width=True):
-            if not user_input.strip():
-                st.warning("⚠️ Please enter a request first.")
-                return
-                
-            masked_text, pii_flag = redact_and_flag(user_input)
-            allowed, safety_msg = enforce_safety(user_input)
-            
-            if pii_flag:
-                st.info("🔒 PII detected and masked in your input.")
-            
-            if not allowed:
-                st.error(f"🛡️ Safety Filter Blocked: {safety_msg}")
-                st.session_state["logs"].append({"event": "safety_block", "message": safety_msg})
-                return
-
-            context = {"crop": crop, "state": state, "season": season}
-            route = supervisor.route(masked_text, context)
-
-            st.session_state["store"].update(crop=crop, location=state, season=season, last_agent=route.get("agent"))
-            st.session_state["logs"].append({"event": "supervisor", "route": route, "pii_masked": pii_flag})
-
-            risk_map = full_risk_map(state, weather)
-
-            if route.get("agent") == "planner_agent":
-                plan = generate_plan(calendar, crop, state, season, risk_map)
-                checklist = readiness_defaults.get(crop, {}).get(state, {})
-                readiness = build_readiness(checklist)
-                
-                st.success("✅ Planner Agent Output")
-                
-                # Header with context
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("🌱 Crop", plan['crop'])
-                with col2:
-                    st.metric("📍 Location", plan['state'])
-                with col3:
-                    st.metric("📆 Season", plan['season'])
-                with col4:
-                    st.metric("📋 Tasks", len(plan.get("tasks", [])))
-                
-                st.divider()
-                
-                if plan.get("tasks"):
-                    st.markdown("### 📅 Month-wise Task Plan")
-                    st.caption("Format: **TASK → WHEN → WHY → HOW → RISK**")
-                    
-                    for idx, task in enumerate(plan["tasks"], 1):
-                        # Month badge at the top
-                        month = task.get('month') or task.get('when', 'N/A')
-                        if not month or month == '':
-                            month = 'TBD'
-                        
-                        st.markdown(f"<div class='task-month'>📅 **{month}**</div>", unsafe_allow_html=True)
-                        
-                        with st.container(border=True):
-                            # Main task title
-                            st.markdown(f"#### ✅ {task.get('task', '')}")
-                            
-                            # Info in columns for better layout
-                            info_col1, info_col2 = st.columns([1, 1])
-                            
-                            with info_col1:
-                                st.markdown(f"**⏰ When:** {task.get('when', '')}")
-                                st.markdown(f"**💡 Why:** {task.get('why', '')}")
-                            
-                            with info_col2:
-                                st.markdown(f"**🔧 How:** {task.get('how', '')}")
-                            
-                            # Risk assessment
-                            st.divider()
-                            risk_level = task.get('risk', 'Medium')
-                            
-                            if 'High' in risk_level or 'Delayed' in risk_level or 'stress' in risk_level.lower() or 'storm' in risk_level.lower():
-                                st.warning(f"⚠️ **Risk Level:** 🔴 **{risk_level}**")
-                            elif 'Medium' in risk_level or 'rain' in risk_level.lower() or 'humidity' in risk_level.lower():
-                                st.info(f"ℹ️ **Risk Level:** 🟡 **{risk_level}**")
-                            else:
-                                st.success(f"✓ **Risk Level:** 🟢 **{risk_level}**")
-                            
-                            # Critical alerts
-                            if task.get("risk_alert"):
-                                st.error(f"🚨 **Critical Alert:** {task['risk_alert']}")
-                        
-                        st.write("")  # Spacing between tasks
-                else:
-                    st.warning(plan.get("note", "No tasks available."))
+        get_audit_sink().record({"event": "safety_block", **audit})
+        return
 
-                st.divider()
-                
-                # Readiness checklist in columns
-                st.markdown("### 📦 Input Readiness Checklist")
-                st.caption("Non-monetary requirements for this season")
-                
-                checklist_cols = st.columns(2)
-                for idx, (key, value) in enumerate(readiness.items()):
-                    with checklist_cols[idx % 2]:
-                        with st.container(border=True):
-                            st.markdown(f"**{key}**")
-                            if isinstance(value, list):
-                                for item in value:
-                                    st.markdown(f"  • {item}")
-                            else:
-                                st.markdown(f"`{value}`")
-
-            elif route.get("agent") == "risk_agent":
-                st.warning("⚠️ Risk Agent Output")
-                st.markdown(f"### 🌦️ Weather Risk Assessment: {state}")
-                st.caption("Monthly risk levels and alerts")
-                
-                risk_map = full_risk_map(state, weather)
-                risk_lines = summarize_risks(risk_map)
-                
-                # Display in columns for better layout
-                risk_cols = st.columns(2)
-                for idx, line in enumerate(risk_lines):
-                    with risk_cols[idx % 2]:
-                        if "🔴" in line:
-                            st.error(line)
-                        elif "🟡" in line:
-                            st.warning(line)
-                        else:
-                            st.success(line)
-
-            elif route.get("agent") == "pest_agent":
-                st.info("🐛 Pest / RNAi Agent Output")
-                pest = explain_pest(crop)
-                
-                st.markdown(f"### {pest['topic'].title()} Pest Management")
-                
-                with st.container(border=True):
-                    st.markdown("**🔬 Monitoring & Approach**")
-                    st.markdown(pest['explanation'])
-                
-                st.divider()
-                
-                with st.container(border=True):
-                    st.markdown("**🧬 Why RNAi Technology?**")
-                    st.markdown(pest['why_rnai'])
-                
-                st.divider()
-                
-                with st.container(border=True):
-                    st.markdown("**🛡️ Safety & Best Practices**")
-                    st.markdown(pest['safety'])
+    context = {"crop": crop, "state": state, "season": season}
+    started = time.perf_counter()
+    route = get_supervisor().route(masked_text, context)
+    audit["latency_ms"]["route"] = round(1000 * (time.perf_counter() - started), 3)
+    get_audit_sink().record({"event": "route", "route": route, **audit})
 
-            else:
-                st.write("❌ No agent selected.")
+    st.session_state["store"].update(crop=crop, location=state, season=season, last_agent=route.get("agent"))
+    st.session_state["logs"].append({"event": "supervisor", "route": route, "pii_masked": pii_flag})
 
-    with col_logs:
-        st.subheader("🔍 Agent Reasoning / Logs")
-        st.caption("Transparency: See supervisor routing & guardrail actions")
-        
-        if not st.session_state["logs"]:
-            st.info("No logs yet. Run an agent to see reasoning.")
-        
-        for log in reversed(st.session_state["logs"][-5:]):  # Show last 5
-            if log.get("event") == "supervisor":
-                route = log.get("route", {})
-                st.code(
-                    f"🧠 Supervisor Detected:\n"
-                    f"Intent: {route.get('intent')}\n"
-                    f"Agent: {route.get('agent')}\n"
-                    f"Reason: {route.get('reason')}\n"
-                    f"PII Masked: {log.get('pii_masked')}\n"
-                    f"Note: Repeated intents may reuse cached routing from session memory."
-                )
-            elif log.get("event") == "safety_block":
-                st.code(f"🛡️ Blocked: {log.get('message')}")
-
-        st.caption("")
-        
-        # Add clear logs button
-        if st.button("🗑️ Clear Logs"):
-            st.session_state["logs"] = []
-            st.rerun()
+    agent = route.get("agent")
+    if agent == "planner_agent":
+        view = plan_view(crop, state, season)
+    elif agent == "risk_agent":
+        view = risk_view(state, date.today())
+    elif agent == "pest_agent":
+        view = pest_view(masked_text, crop)
+    else:
+        view = None
+    st.session_state["result"] = {"agent": agent, "view": view, "inputs": (crop, state, season)}
 
 
 if __name__ == "__main__":
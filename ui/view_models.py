@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+from agents.pest_agent import explain_pest
+from agents.planner_agent import build_readiness, generate_plan
+from agents.risk_agent import full_risk_map, summarize_risks
+from agents.risk_task_index import RiskTaskIndex
+from tools.pest_knowledge import PestKnowledgeBase
+from tools.renderer import Renderer
+
+
+@dataclass(frozen=True)
+class TaskCard:
+    month: str
+    task: str
+    when: str
+    why: str
+    how: str
+    risk: str
+    risk_tier: str
+    risk_alert: str
+
+
+@dataclass(frozen=True)
+class PlanView:
+    crop: str
+    state: str
+    season: str
+    tasks: Tuple[TaskCard, ...]
+    note: str
+    readiness: Tuple[Tuple[str, Any], ...]
+
+
+@dataclass(frozen=True)
+class RiskView:
+    state: str
+    lines: Tuple[Tuple[str, str], ...]
+    upcoming: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class PestView:
+    title: str
+    explanation: str
+    why_rnai: str
+    safety: str
+
+
+def risk_tier(risk_level: str) -> str:
+    """Map a task's risk text to the high/medium/low tier used for colouring."""
+    lowered = risk_level.lower()
+    if "High" in risk_level or "Delayed" in risk_level or "stress" in lowered or "storm" in lowered:
+        return "high"
+    if "Medium" in risk_level or "rain" in lowered or "humidity" in lowered:
+        return "medium"
+    return "low"
+
+
+def _line_tier(line: str) -> str:
+    if "🔴" in line:
+        return "high"
+    if "🟡" in line:
+        return "medium"
+    return "low"
+
+
+def build_plan_view(
+    calendar: Dict[str, Any],
+    weather: Dict[str, Any],
+    readiness_defaults: Dict[str, Any],
+    crop: str,
+    state: str,
+    season: str,
+    index: Optional[RiskTaskIndex] = None,
+) -> PlanView:
+    """Run the planner once and flatten its output into a render-ready view."""
+    plan = generate_plan(calendar, crop, state, season, full_risk_map(state, weather), index=index)
+    cards = []
+    for task in plan.get("tasks", []):
+        risk = task.get("risk", "Medium")
+        cards.append(
+            TaskCard(
+                month=task.get("month") or task.get("when") or "TBD",
+                task=task.get("task", ""),
+                when=task.get("when", ""),
+                why=task.get("why", ""),
+                how=task.get("how", ""),
+                risk=risk,
+                risk_tier=risk_tier(risk),
+                risk_alert=task.get("risk_alert", ""),
+            )
+        )
+    readiness = build_readiness(readiness_defaults.get(crop, {}).get(state, {}))
+    return PlanView(
+        crop=plan["crop"],
+        state=plan["state"],
+        season=plan["season"],
+        tasks=tuple(cards),
+        note=plan.get("note", "No tasks available."),
+        readiness=tuple((key, tuple(value) if isinstance(value, list) else value) for key, value in readiness.items()),
+    )
+
+
+def build_risk_view(
+    weather: Dict[str, Any],
+    state: str,
+    index: Optional[RiskTaskIndex] = None,
+    today: Optional[date] = None,
+    horizon_days: int = 60,
+    renderer: Optional[Renderer] = None,
+) -> RiskView:
+    lines = summarize_risks(full_risk_map(state, weather), renderer=renderer, state=state)
+    upcoming: Tuple[str, ...] = ()
+    if index is not None:
+        tasks = index.tasks_in_window(state, today or date.today(), horizon_days)
+        upcoming = tuple(f"**{t['month']}** · {t['crop']} ({t['season']}): {t['task']}" for t in tasks)
+    return RiskView(state=state, lines=tuple((_line_tier(line), line) for line in lines), upcoming=upcoming)
+
+
+def build_pest_view(
+    question: str, knowledge_base: Optional[PestKnowledgeBase] = None, crop: Optional[str] = None
+) -> PestView:
+    pest = explain_pest(question, knowledge_base, crop=crop)
+    return PestView(
+        title=f"{pest['topic'].title()} Pest Management",
+        explanation=pest["explanation"],
+        why_rnai=pest["why_rnai"],
+        safety=pest["safety"],
+    )